@@ -14,6 +14,9 @@ PRODUCTS_PATH = os.path.join(DATA_DIR, "ProductLibrary.xlsx")
 COMPETITOR_PATH = os.path.join(DATA_DIR, "Competitor_Prices.xlsx")
 ORDERS_PATH = os.path.join(DATA_DIR, "OrderProcessing.xlsx")
 
+# Low-cardinality label columns stored as categoricals for cheaper grouping/matching
+CATEGORICAL_COLS = ["Tier", "Category", "Product_Lifecycle"]
+
 
 def compute_demand_index(orders_df, min_index=0.5, max_index=1.5):
     """Compute demand index from orders (simplified)."""
@@ -38,11 +41,55 @@ def compute_demand_index(orders_df, min_index=0.5, max_index=1.5):
     return demand[["SKU", "demand_index"]]
 
 
+# (path, mtime) of workbooks whose Parquet write failed in this process
+_PARQUET_FAILED = set()
+
+
+def read_excel_cached(path):
+    """
+    Read an Excel workbook through a Parquet copy saved next to it.
+    The copy is rebuilt whenever the workbook is newer; if no Parquet
+    engine (pyarrow) is installed this is a plain read_excel.
+    """
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+            return pd.read_parquet(parquet_path)
+    except (OSError, ImportError, ValueError):
+        pass  # No usable copy yet
+    
+    df = pd.read_excel(path, engine="openpyxl")
+    
+    # Columns mixing numbers and text (e.g. Order_ID) become text, which Parquet
+    # can store; done before returning too so cold and warm reads match
+    for column in df.columns[df.dtypes == object]:
+        if df[column].dropna().map(type).nunique() > 1:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    
+    version = (path, os.path.getmtime(path))
+    if version in _PARQUET_FAILED:
+        return df
+    
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp_path = parquet_path + ".tmp"
+    try:
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        # No pyarrow (or an unconvertible column): keep the Excel path, and
+        # don't retry until the workbook changes
+        _PARQUET_FAILED.add(version)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"⚠ Warning: Could not cache {os.path.basename(path)} as Parquet - {e}")
+    return df
+
+
 def load_all_data():
     """Load all product data from Excel files."""
     
     # Load products and remove duplicates
-    products_df = pd.read_excel(PRODUCTS_PATH, engine="openpyxl")
+    products_df = read_excel_cached(PRODUCTS_PATH)
     products_df["SKU"] = products_df["SKU"].astype(str)
     
     # CRITICAL: Remove duplicate SKUs, keep first occurrence
@@ -50,14 +97,14 @@ def load_all_data():
     print(f"✓ Loaded {len(products_df)} unique products from ProductLibrary")
     
     # Load competitors and remove duplicates
-    competitor_df = pd.read_excel(COMPETITOR_PATH, engine="openpyxl")
+    competitor_df = read_excel_cached(COMPETITOR_PATH)
     competitor_df["SKU"] = competitor_df["SKU"].astype(str)
     competitor_df = competitor_df.drop_duplicates(subset=['SKU'], keep='first')
     print(f"✓ Loaded {len(competitor_df)} unique competitor records")
     
     # Load orders and compute demand
     try:
-        orders_df = pd.read_excel(ORDERS_PATH, engine="openpyxl")
+        orders_df = read_excel_cached(ORDERS_PATH)
         orders_df["SKU"] = orders_df["SKU"].astype(str)
         demand_df = compute_demand_index(orders_df)
         print(f"✓ Calculated demand for {len(demand_df)} SKUs from orders")
@@ -103,6 +150,11 @@ def load_all_data():
     # Estimate cost (70% of base price)
     merged_df["cost"] = merged_df["Base_Price"] * 0.70
     
+    # Convert label columns to categoricals once at load
+    for col in CATEGORICAL_COLS:
+        if col in merged_df.columns:
+            merged_df[col] = merged_df[col].astype("category")
+    
     # Final verification
     print(f"✓ Final dataset: {len(merged_df)} unique products")
     print(f"✓ Duplicate check: {merged_df['SKU'].duplicated().sum()} duplicates found")
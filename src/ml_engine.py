@@ -80,6 +80,23 @@ def _clamp(value: float, low: float, high: float) -> float:
     """From your notebook."""
     return max(low, min(high, value))
 
+def _lookup(values, table: Dict[str, float], default: float) -> np.ndarray:
+    """
+    Map labels to numbers through categorical codes and a lookup array.
+    Labels missing from the table get the default.
+    """
+    codes = pd.Categorical(values, categories=list(table)).codes
+    lut = np.append(np.fromiter(table.values(), dtype=np.float64, count=len(table)), default)
+    return lut[codes]  # code -1 (unknown) picks the trailing default
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Element-wise round() on an array.
+    np.round scales by 10**ndigits first, which can tip half-cent ties
+    (e.g. 11.655) the other way from the scalar path.
+    """
+    return np.fromiter((round(v, ndigits) for v in values.tolist()), dtype=np.float64, count=len(values))
+
 def _pct_change(old: float, new: float) -> float:
     """From your notebook."""
     if old == 0:
@@ -119,11 +136,12 @@ class SmartTagEngine:
         Based on your notebook's tag logic.
         """
         tags = []
+        lifecycle_lower = lifecycle.lower() if lifecycle else ""
         
         # Lifecycle tags (from your notebook)
-        if lifecycle and lifecycle.lower() == "launch":
+        if lifecycle_lower == "launch":
             tags.append(cls.TAG_DEFINITIONS["new_arrival"])
-        elif lifecycle and lifecycle.lower() == "decline":
+        elif lifecycle_lower == "decline":
             tags.append(cls.TAG_DEFINITIONS["declining"])
         
         # Competitor out of stock (from your notebook)
@@ -181,7 +199,11 @@ class GradientBoostingPricingModel:
         """
         np.random.seed(42)
         
-        training_data = []
+        # Parallel column lists; labels are encoded in one transform per column at the end
+        cols = {name: [] for name in (
+            "Base_Price", "tier", "category", "lifecycle", "competitor_avg",
+            "price_vs_competitor", "market_oos", "demand_index", "target_adjustment"
+        )}
         
         # Sample product characteristics
         tiers = ["Low", "Mid", "High"]
@@ -219,11 +241,12 @@ class GradientBoostingPricingModel:
                 adjustment -= (1.0 - demand_index) * 0.10  # demand_down_max from your notebook
             
             # Lifecycle (from your PricingRules - exact values)
-            if lifecycle.lower() == "launch":
+            lifecycle_lower = lifecycle.lower()
+            if lifecycle_lower == "launch":
                 adjustment -= 0.10  # launch_discount from your notebook
-            elif lifecycle.lower() == "growth":
+            elif lifecycle_lower == "growth":
                 adjustment += 0.05  # growth_increase from your notebook
-            elif lifecycle.lower() == "decline":
+            elif lifecycle_lower == "decline":
                 adjustment -= 0.20  # decline_discount from your notebook
             
             # Season (from your notebook)
@@ -241,19 +264,27 @@ class GradientBoostingPricingModel:
             
             price_vs_comp = base_price / competitor_avg if competitor_avg > 0 else 1.0
             
-            training_data.append({
-                "Base_Price": base_price,
-                "tier_encoded": self.encoders["tier"].transform([tier])[0],
-                "category_encoded": self.encoders["category"].transform([category])[0],
-                "lifecycle_encoded": self.encoders["lifecycle"].transform([lifecycle])[0],
-                "competitor_avg": competitor_avg,
-                "price_vs_competitor": price_vs_comp,
-                "market_oos": market_oos,
-                "demand_index": demand_index,
-                "target_adjustment": adjustment
-            })
-        
-        return pd.DataFrame(training_data)
+            cols["Base_Price"].append(base_price)
+            cols["tier"].append(tier)
+            cols["category"].append(category)
+            cols["lifecycle"].append(lifecycle)
+            cols["competitor_avg"].append(competitor_avg)
+            cols["price_vs_competitor"].append(price_vs_comp)
+            cols["market_oos"].append(market_oos)
+            cols["demand_index"].append(demand_index)
+            cols["target_adjustment"].append(adjustment)
+        
+        return pd.DataFrame({
+            "Base_Price": np.asarray(cols["Base_Price"], dtype=np.float64),
+            "tier_encoded": self.encoders["tier"].transform(cols["tier"]),
+            "category_encoded": self.encoders["category"].transform(cols["category"]),
+            "lifecycle_encoded": self.encoders["lifecycle"].transform(cols["lifecycle"]),
+            "competitor_avg": np.asarray(cols["competitor_avg"], dtype=np.float64),
+            "price_vs_competitor": np.asarray(cols["price_vs_competitor"], dtype=np.float64),
+            "market_oos": np.asarray(cols["market_oos"], dtype=np.int64),
+            "demand_index": np.asarray(cols["demand_index"], dtype=np.float64),
+            "target_adjustment": np.asarray(cols["target_adjustment"], dtype=np.float64),
+        })
     
     def train(self, n_samples: int = 2000) -> Dict[str, float]:
         """
@@ -329,6 +360,38 @@ class GradientBoostingPricingModel:
         ]])
         
         return float(self.model.predict(features)[0])
+    
+    def predict_adjustments(self,
+                            base_price: np.ndarray,
+                            tier: np.ndarray,
+                            category: np.ndarray,
+                            lifecycle: np.ndarray,
+                            competitor_avg: np.ndarray,
+                            market_oos: np.ndarray,
+                            demand_index: np.ndarray) -> np.ndarray:
+        """
+        Vectorized predict_adjustment() over column arrays.
+        Unknown labels fall back to the same codes as the scalar path.
+        """
+        if not self.is_trained:
+            self.train()
+        
+        def encode(name, values, fallback):
+            classes = self.encoders[name].classes_
+            return _lookup(values, dict(zip(classes, range(len(classes)))), fallback)
+        
+        safe_comp = np.where(competitor_avg > 0, competitor_avg, 1.0)
+        price_vs_comp = np.where(competitor_avg > 0, base_price / safe_comp, 1.0)
+        
+        features = np.column_stack([
+            base_price,
+            encode("tier", tier, 1),        # Default to Mid
+            encode("category", category, 3),  # Default to Other
+            encode("lifecycle", lifecycle, 2),  # Default to Maturity
+            competitor_avg, price_vs_comp, market_oos.astype(np.float64), demand_index
+        ])
+        
+        return self.model.predict(features)
 
 # =============================================================================
 # RULE-BASED PRICING (from your notebook's calculate_price logic)
@@ -505,6 +568,123 @@ class PricingEngine:
             "rule_adjustments": rule_adjustments,
         }
 
+    def _batch_adjustments(self, products_df: pd.DataFrame):
+        """
+        Steps 1-2 of get_recommendation() over a products DataFrame:
+        returns base, cost, min_margin, rules_price, rules_adjustment, ml_adjustment arrays.
+        """
+        rules = DEFAULT_RULES
+        
+        base = products_df['Base_Price'].to_numpy(np.float64)
+        cost = products_df['cost'].to_numpy(np.float64)
+        competitor_avg = products_df['competitor_avg'].to_numpy(np.float64)
+        demand_index = products_df['demand_index'].to_numpy(np.float64)
+        market_oos = products_df['market_out_of_stock'].to_numpy(bool)
+        lifecycle_lower = products_df['Product_Lifecycle'].str.lower()
+        min_margin = _lookup(
+            products_df['Tier'].str.lower(),
+            {name: cfg.min_margin_pct for name, cfg in TIER_CONFIGS.items()},
+            TIER_CONFIGS["mid"].min_margin_pct
+        )
+        
+        # 1. Rule-based price (same steps as calculate_rules_price)
+        uplift = rules.demand_up_min + np.clip(demand_index - 1.0, 0.0, 1.0) * (rules.demand_up_max - rules.demand_up_min)
+        discount = np.clip(1.0 - demand_index, 0.0, 1.0) * rules.demand_down_max
+        rules_price = base * np.select(
+            [demand_index > 1.0, demand_index < 1.0], [1 + uplift, 1 - discount], 1.0
+        )
+        rules_price = rules_price * _lookup(lifecycle_lower, {
+            "launch": 1 - rules.launch_discount,
+            "growth": 1 + rules.growth_increase,
+            "maturity": 1 + rules.maturity_adjustment,
+            "decline": 1 - rules.decline_discount,
+        }, 1.0)
+        oos_bump = (rules.out_of_stock_bump_min + rules.out_of_stock_bump_max) / 2
+        rules_price = np.where(market_oos, rules_price * (1 + oos_bump), rules_price)
+        rules_price = np.maximum(rules_price, cost * (1 + min_margin))
+        rules_adjustment = (rules_price - base) / base
+        
+        # 2. ML price
+        ml_adjustment = self.ml_model.predict_adjustments(
+            base,
+            products_df['Tier'].to_numpy(object),
+            products_df['Category'].to_numpy(object),
+            products_df['Product_Lifecycle'].to_numpy(object),
+            competitor_avg, market_oos, demand_index
+        )
+        
+        return base, cost, min_margin, rules_price, rules_adjustment, ml_adjustment
+
+    def get_recommended_prices_batch(self, products_df: pd.DataFrame, ml_weights) -> np.ndarray:
+        """
+        recommended_price of get_recommendations_batch() at several ML weights,
+        shape (len(ml_weights), len(products_df)). The rules and ML adjustments
+        are computed once and no tags or result frame are built.
+        """
+        base, cost, min_margin, _, rules_adjustment, ml_adjustment = self._batch_adjustments(products_df)
+        min_price = cost * (1 + min_margin)
+        
+        prices = np.empty((len(ml_weights), len(base)))
+        for out, ml_weight in zip(prices, ml_weights):
+            blended_adjustment = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
+            out[:] = _round(np.maximum(base * (1 + blended_adjustment), min_price), 2)
+        return prices
+
+    def get_recommendations_batch(self, products_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized get_recommendation() over a products DataFrame.
+        Returns one row per product with the same fields as the scalar path
+        (minus rule_adjustments, plus an int32 tag_count), indexed like products_df.
+        """
+        base, cost, min_margin, rules_price, rules_adjustment, ml_adjustment = self._batch_adjustments(products_df)
+        competitor_avg = products_df['competitor_avg'].to_numpy(np.float64)
+        demand_index = products_df['demand_index'].to_numpy(np.float64)
+        market_oos = products_df['market_out_of_stock'].to_numpy(bool)
+        tier = products_df['Tier'].to_numpy(object)
+        lifecycle_lower = products_df['Product_Lifecycle'].str.lower()
+        min_price = cost * (1 + min_margin)
+        ml_price = base * (1 + ml_adjustment)
+        
+        # 3-4. Hybrid price with minimum margin
+        blended_adjustment = (1 - self.ml_weight) * rules_adjustment + self.ml_weight * ml_adjustment
+        hybrid_price = np.maximum(base * (1 + blended_adjustment), min_price)
+        
+        # 5. Final margin
+        safe_price = np.where(hybrid_price > 0, hybrid_price, 1.0)
+        margin_pct = np.where(hybrid_price > 0, (hybrid_price - cost) / safe_price * 100, 0.0)
+        
+        # 6. Smart tags (same order as SmartTagEngine.generate_tags)
+        defs = SmartTagEngine.TAG_DEFINITIONS
+        tag_masks = [
+            ((lifecycle_lower == "launch").to_numpy(), defs["new_arrival"]),
+            ((lifecycle_lower == "decline").to_numpy(), defs["declining"]),
+            (market_oos, defs["competitor_oos"]),
+            (demand_index > 1.2, defs["high_demand"]),
+            ((competitor_avg > 0) & (hybrid_price < competitor_avg * 0.95), defs["price_leader"]),
+            (margin_pct < min_margin * 100, defs["margin_watch"]),
+        ]
+        smart_tags = [[] for _ in range(len(base))]
+        tag_count = np.zeros(len(base), dtype=np.int32)
+        for mask, tag in tag_masks:
+            tag_count += mask
+            for i in np.flatnonzero(mask):
+                smart_tags[i].append(tag)
+        
+        return pd.DataFrame({
+            "product_name": products_df['Product_Name'].to_numpy(object),
+            "recommended_price": _round(hybrid_price, 2),
+            "rules_price": _round(rules_price, 2),
+            "ml_price": _round(ml_price, 2),
+            "ml_adjustment_pct": _round(ml_adjustment * 100, 1),
+            "price_change_pct": _round((hybrid_price - base) / base * 100, 1),
+            "margin_pct": _round(margin_pct, 1),
+            "smart_tags": smart_tags,
+            "tag_count": tag_count,
+            "tier": tier,
+            "demand_index": demand_index,
+            "competitor_avg": competitor_avg,
+        }, index=products_df.index)
+
 # =============================================================================
 # SINGLETON FACTORY
 # =============================================================================
@@ -220,6 +220,22 @@ st.markdown("""
         box-shadow: 0 12px 32px rgba(0, 0, 0, 0.3);
     }
     
+    /* Card grids - a whole row of cards is emitted as one markdown block */
+    .kpi-grid,
+    .competitor-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 16px;
+    }
+    
+    .kpi-grid {
+        margin-bottom: 24px;
+    }
+    
+    .competitor-grid {
+        margin-top: 16px;
+    }
+    
     /* Metric Icons */
     .metric-icon {
         width: 56px;
@@ -346,7 +362,7 @@ st.markdown("""
         color: #FFFFFF;
         font-size: 28px;
         font-weight: 700;
-        margin: 40px 0 20px 0;
+        margin: 72px 0 20px 0;
         letter-spacing: -0.5px;
     }
     
@@ -13,11 +13,207 @@ def get_data():
     return mock_pricing_data, revenue_data
 
 
+# Charts that only summarize data skip client-side interactivity
+STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+
+@st.cache_data(show_spinner=False)
+def _products_df():
+    """Build the products DataFrame once and share it across all subtabs."""
+    mock_pricing_data, _ = get_data()
+    return pd.DataFrame(mock_pricing_data)
+
+
+# Figures depend only on the static data module, so they are built once
+# and reused across reruns triggered by the filter widgets.
+@st.cache_data(show_spinner=False)
+def _revenue_figure():
+    """Revenue by month: current vs optimized bars with profit line."""
+    _, revenue_data = get_data()
+    df_revenue = pd.DataFrame(revenue_data)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=df_revenue['month'],
+        y=df_revenue['current'],
+        name='Current',
+        marker_color='#8B1538'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=df_revenue['month'],
+        y=df_revenue['optimized'],
+        name='Optimized',
+        marker_color='#d4af37'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=df_revenue['month'],
+        y=df_revenue['profit'],
+        name='Profit',
+        mode='lines+markers',
+        marker=dict(size=10, color='#10b981'),
+        line=dict(color='#10b981', width=3),
+        yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(29, 20, 25, 0.8)',
+        plot_bgcolor='rgba(29, 20, 25, 0.8)',
+        font=dict(color='#c9a6ae'),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(title='Revenue ($)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
+        yaxis2=dict(title='Profit ($)', overlaying='y', side='right', showgrid=False),
+        barmode='group',
+        height=400,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _category_figure():
+    """Category stats table and the matching sunburst figure."""
+    df_products = _products_df()
+    
+    # Category breakdown
+    category_stats = df_products.groupby('category').agg({
+        'currentPrice': 'mean',
+        'optimizedPrice': 'mean',
+        'margin': 'mean',
+        'product': 'count'
+    }).reset_index()
+    category_stats.columns = ['Category', 'Avg Current Price', 'Avg Optimized Price', 'Avg Margin', 'Product Count']
+    
+    # Create sunburst chart
+    fig_sunburst = go.Figure(go.Sunburst(
+        labels=['All Products'] + list(category_stats['Category']),
+        parents=[''] + ['All Products'] * len(category_stats),
+        values=[category_stats['Product Count'].sum()] + list(category_stats['Product Count']),
+        marker=dict(
+            colors=['#8B1538'] + ['#d4af37', '#a01d48', '#c9a6ae', '#8B1538', '#d4af37', '#a01d48', '#c9a6ae'][:len(category_stats)]
+        ),
+        textinfo='label+percent parent'
+    ))
+    
+    fig_sunburst.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(29, 20, 25, 0.8)',
+        height=400
+    )
+    
+    return category_stats, fig_sunburst
+
+
+@st.cache_data(show_spinner=False)
+def _price_change_figure():
+    """Histogram of optimized price changes."""
+    df_products = _products_df()
+    
+    # Create histogram of price changes
+    fig_hist = go.Figure()
+    
+    fig_hist.add_trace(go.Histogram(
+        x=df_products['change'],
+        nbinsx=15,
+        marker=dict(
+            color=df_products['change'],
+            colorscale=[[0, '#ef4444'], [0.5, '#f59e0b'], [1, '#10b981']],
+            line=dict(color='#8B1538', width=1)
+        ),
+        name='Price Changes'
+    ))
+    
+    fig_hist.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(29, 20, 25, 0.8)',
+        plot_bgcolor='rgba(29, 20, 25, 0.8)',
+        font=dict(color='#c9a6ae'),
+        xaxis=dict(title='Price Change (%)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
+        yaxis=dict(title='Number of Products', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
+        height=400
+    )
+    
+    return fig_hist
+
+
+@st.cache_data(show_spinner=False)
+def _margin_demand_figure():
+    """Margin vs demand scatter, sized by current price."""
+    df_products = _products_df()
+    
+    demand_map = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+    df_products['demand_score'] = df_products['demand'].map(demand_map)
+    
+    fig_scatter = go.Figure()
+    
+    fig_scatter.add_trace(go.Scatter(
+        x=df_products['demand_score'],
+        y=df_products['margin'],
+        mode='markers',
+        marker=dict(
+            size=df_products['currentPrice'] * 2,
+            color=df_products['margin'],
+            colorscale='RdYlGn',
+            showscale=True,
+            colorbar=dict(title="Margin %"),
+            line=dict(color='#8B1538', width=1)
+        ),
+        text=df_products['product'],
+        hovertemplate='<b>%{text}</b><br>Demand: %{x}<br>Margin: %{y:.1f}%<extra></extra>'
+    ))
+    
+    fig_scatter.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(29, 20, 25, 0.8)',
+        plot_bgcolor='rgba(29, 20, 25, 0.8)',
+        font=dict(color='#c9a6ae'),
+        xaxis=dict(title='Demand Level', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)',
+                  ticktext=['Low', 'Medium', 'High', 'Very High'],
+                  tickvals=[1, 2, 3, 4]),
+        yaxis=dict(title='Margin (%)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
+        height=350
+    )
+    
+    return fig_scatter
+
+
+@st.cache_data(show_spinner=False)
+def _tier_figure():
+    """Donut chart of products per tier."""
+    df_products = _products_df()
+    
+    tier_counts = df_products['tier'].value_counts()
+    
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=tier_counts.index,
+        values=tier_counts.values,
+        hole=.4,
+        marker=dict(colors=['#8B1538', '#d4af37', '#a01d48']),
+        textinfo='label+percent',
+        textfont=dict(color='#fff')
+    )])
+    
+    fig_pie.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(29, 20, 25, 0.8)',
+        font=dict(color='#c9a6ae'),
+        height=350,
+        showlegend=True
+    )
+    
+    return fig_pie
+
+
 def render():
     """Render the Analytics tab"""
     
     # Get data using lazy import
-    mock_pricing_data, revenue_data = get_data()
+    _, revenue_data = get_data()
+    df_products = _products_df()
     
     st.markdown("### 📈 Advanced Analytics")
     
@@ -92,48 +288,8 @@ def render():
         # Revenue breakdown chart
         st.markdown("#### Revenue by Month")
         
-        df_revenue = pd.DataFrame(revenue_data)
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=df_revenue['month'],
-            y=df_revenue['current'],
-            name='Current',
-            marker_color='#8B1538'
-        ))
-        
-        fig.add_trace(go.Bar(
-            x=df_revenue['month'],
-            y=df_revenue['optimized'],
-            name='Optimized',
-            marker_color='#d4af37'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=df_revenue['month'],
-            y=df_revenue['profit'],
-            name='Profit',
-            mode='lines+markers',
-            marker=dict(size=10, color='#10b981'),
-            line=dict(color='#10b981', width=3),
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(29, 20, 25, 0.8)',
-            plot_bgcolor='rgba(29, 20, 25, 0.8)',
-            font=dict(color='#c9a6ae'),
-            xaxis=dict(showgrid=False),
-            yaxis=dict(title='Revenue ($)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
-            yaxis2=dict(title='Profit ($)', overlaying='y', side='right', showgrid=False),
-            barmode='group',
-            height=400,
-            hovermode='x unified'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        fig = _revenue_figure()
+        st.plotly_chart(fig, use_container_width=True, config=STATIC_PLOT_CONFIG)
         
         # Revenue metrics
         col1, col2, col3 = st.columns(3)
@@ -154,35 +310,8 @@ def render():
         # Category performance
         st.markdown("#### Performance by Category")
         
-        df_products = pd.DataFrame(mock_pricing_data)
-        
-        # Category breakdown
-        category_stats = df_products.groupby('category').agg({
-            'currentPrice': 'mean',
-            'optimizedPrice': 'mean',
-            'margin': 'mean',
-            'product': 'count'
-        }).reset_index()
-        category_stats.columns = ['Category', 'Avg Current Price', 'Avg Optimized Price', 'Avg Margin', 'Product Count']
-        
-        # Create sunburst chart
-        fig_sunburst = go.Figure(go.Sunburst(
-            labels=['All Products'] + list(category_stats['Category']),
-            parents=[''] + ['All Products'] * len(category_stats),
-            values=[category_stats['Product Count'].sum()] + list(category_stats['Product Count']),
-            marker=dict(
-                colors=['#8B1538'] + ['#d4af37', '#a01d48', '#c9a6ae', '#8B1538', '#d4af37', '#a01d48', '#c9a6ae'][:len(category_stats)]
-            ),
-            textinfo='label+percent parent'
-        ))
-        
-        fig_sunburst.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(29, 20, 25, 0.8)',
-            height=400
-        )
-        
-        st.plotly_chart(fig_sunburst, use_container_width=True)
+        category_stats, fig_sunburst = _category_figure()
+        st.plotly_chart(fig_sunburst, use_container_width=True, config=STATIC_PLOT_CONFIG)
         
         # Category table
         st.markdown("#### Category Details")
@@ -201,33 +330,8 @@ def render():
         # Price change analysis
         st.markdown("#### Price Change Distribution")
         
-        df_products = pd.DataFrame(mock_pricing_data)
-        
-        # Create histogram of price changes
-        fig_hist = go.Figure()
-        
-        fig_hist.add_trace(go.Histogram(
-            x=df_products['change'],
-            nbinsx=15,
-            marker=dict(
-                color=df_products['change'],
-                colorscale=[[0, '#ef4444'], [0.5, '#f59e0b'], [1, '#10b981']],
-                line=dict(color='#8B1538', width=1)
-            ),
-            name='Price Changes'
-        ))
-        
-        fig_hist.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(29, 20, 25, 0.8)',
-            plot_bgcolor='rgba(29, 20, 25, 0.8)',
-            font=dict(color='#c9a6ae'),
-            xaxis=dict(title='Price Change (%)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
-            yaxis=dict(title='Number of Products', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
-            height=400
-        )
-        
-        st.plotly_chart(fig_hist, use_container_width=True)
+        fig_hist = _price_change_figure()
+        st.plotly_chart(fig_hist, use_container_width=True, config=STATIC_PLOT_CONFIG)
         
         # Price change stats
         col1, col2, col3, col4 = st.columns(4)
@@ -257,65 +361,14 @@ def render():
     with col1:
         st.markdown("#### 📊 Margin vs Demand Correlation")
         
-        df_products = pd.DataFrame(mock_pricing_data)
-        demand_map = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1}
-        df_products['demand_score'] = df_products['demand'].map(demand_map)
-        
-        fig_scatter = go.Figure()
-        
-        fig_scatter.add_trace(go.Scatter(
-            x=df_products['demand_score'],
-            y=df_products['margin'],
-            mode='markers',
-            marker=dict(
-                size=df_products['currentPrice'] * 2,
-                color=df_products['margin'],
-                colorscale='RdYlGn',
-                showscale=True,
-                colorbar=dict(title="Margin %"),
-                line=dict(color='#8B1538', width=1)
-            ),
-            text=df_products['product'],
-            hovertemplate='<b>%{text}</b><br>Demand: %{x}<br>Margin: %{y:.1f}%<extra></extra>'
-        ))
-        
-        fig_scatter.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(29, 20, 25, 0.8)',
-            plot_bgcolor='rgba(29, 20, 25, 0.8)',
-            font=dict(color='#c9a6ae'),
-            xaxis=dict(title='Demand Level', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)',
-                      ticktext=['Low', 'Medium', 'High', 'Very High'],
-                      tickvals=[1, 2, 3, 4]),
-            yaxis=dict(title='Margin (%)', showgrid=True, gridcolor='rgba(139, 21, 56, 0.2)'),
-            height=350
-        )
-        
+        fig_scatter = _margin_demand_figure()
         st.plotly_chart(fig_scatter, use_container_width=True)
     
     with col2:
         st.markdown("#### 🎯 Tier Distribution")
         
-        tier_counts = df_products['tier'].value_counts()
-        
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=tier_counts.index,
-            values=tier_counts.values,
-            hole=.4,
-            marker=dict(colors=['#8B1538', '#d4af37', '#a01d48']),
-            textinfo='label+percent',
-            textfont=dict(color='#fff')
-        )])
-        
-        fig_pie.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(29, 20, 25, 0.8)',
-            font=dict(color='#c9a6ae'),
-            height=350,
-            showlegend=True
-        )
-        
-        st.plotly_chart(fig_pie, use_container_width=True)
+        fig_pie = _tier_figure()
+        st.plotly_chart(fig_pie, use_container_width=True, config=STATIC_PLOT_CONFIG)
     
     # Export Options
     st.markdown("<br>", unsafe_allow_html=True)
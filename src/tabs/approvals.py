@@ -4,9 +4,12 @@ Pulls real product recommendations and allows approval/rejection
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import os
+import glob
 from io import BytesIO
+from openpyxl import Workbook, load_workbook
 
 # Import data loader and ML engine
 from data_loader import get_product_data
@@ -14,12 +17,183 @@ from ml_engine import PricingEngine
 
 # Excel file paths
 PENDING_FILE = "approvals_pending.xlsx"
-HISTORY_FILE = "approvals_history.xlsx"
+HISTORY_DIR = "approvals_history"          # one workbook per Action_Date month
+LEGACY_HISTORY_FILE = "approvals_history.xlsx"
+
+PENDING_COLUMNS = [
+    'ID', 'Product', 'Category', 'Tier', 'Current_Price', 'New_Price',
+    'Change_Percent', 'Margin_Percent', 'Competitor_Avg', 'Demand_Index',
+    'Required_Approval', 'Status', 'Suggested_Date', 'Confidence'
+]
+HISTORY_COLUMNS = PENDING_COLUMNS + ['Action', 'Action_Date', 'Action_By', 'Notes']
+
+# Fallbacks for optional item columns when moving items to history
+ITEM_DEFAULTS = {
+    'Category': '', 'Tier': '', 'Margin_Percent': 0, 'Competitor_Avg': 0,
+    'Demand_Index': 1.0, 'Confidence': ''
+}
+
+# Pending cards rendered per page, and the columns a card reads
+PAGE_SIZE = 25
+CARD_COLUMNS = ['ID', 'Product', 'Current_Price', 'New_Price', 'Change_Percent', 'Required_Approval', 'Confidence']
+
+CONFIDENCE_COLORS = {
+    'High Confidence': '#10b981',
+    'Review Suggested': '#f59e0b',
+    'Needs Review': '#ef4444'
+}
+
+# Tab styles, built once at import
+_APPROVALS_CSS = """
+<style>
+.metric-card {
+    background: linear-gradient(135deg, rgba(236, 72, 153, 0.1) 0%, rgba(190, 24, 93, 0.05) 100%);
+    border: 1px solid rgba(236, 72, 153, 0.2);
+    border-radius: 16px;
+    padding: 24px;
+    text-align: center;
+}
+.metric-value {
+    font-size: 36px;
+    font-weight: 700;
+    color: #ec4899;
+    margin: 8px 0;
+}
+.metric-label {
+    color: rgba(255, 255, 255, 0.7);
+    font-size: 14px;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}
+.metric-delta {
+    color: #10b981;
+    font-size: 14px;
+    font-weight: 600;
+    margin-top: 4px;
+}
+.workflow-container-new {
+    background: rgba(30, 20, 25, 0.8);
+    border: 1px solid rgba(255, 255, 255, 0.08);
+    border-radius: 16px;
+    padding: 32px;
+    margin: 24px 0;
+}
+.workflow-title-new {
+    color: #ffffff;
+    font-size: 20px;
+    font-weight: 600;
+    margin-bottom: 24px;
+}
+.workflow-steps-new {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    gap: 16px;
+}
+.workflow-step-new {
+    flex: 1;
+    text-align: center;
+}
+.workflow-circle {
+    width: 80px;
+    height: 80px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 28px;
+    font-weight: 700;
+    margin: 0 auto 12px;
+    border: 3px solid;
+}
+.circle-green {
+    background: rgba(16, 185, 129, 0.15);
+    border-color: #10b981;
+    color: #10b981;
+}
+.circle-pink {
+    background: rgba(236, 72, 153, 0.15);
+    border-color: #ec4899;
+    color: #ec4899;
+}
+.circle-gray {
+    background: rgba(156, 163, 175, 0.15);
+    border-color: #9ca3af;
+    color: #9ca3af;
+}
+.workflow-label {
+    font-size: 16px;
+    font-weight: 600;
+    color: rgba(255, 255, 255, 0.9);
+    margin-bottom: 4px;
+}
+.workflow-description {
+    font-size: 13px;
+    color: rgba(255, 255, 255, 0.5);
+}
+.workflow-count {
+    font-size: 13px;
+    color: rgba(255, 255, 255, 0.6);
+    margin-top: 4px;
+}
+.pending-badge-new {
+    display: inline-block;
+    background: rgba(236, 72, 153, 0.2);
+    color: #ec4899;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-size: 12px;
+    font-weight: 600;
+    margin-top: 8px;
+}
+.pkg-icon {
+    width: 48px;
+    height: 48px;
+    flex-shrink: 0;
+    border-radius: 10px;
+    background: rgba(255, 255, 255, 0.05) url("data:image/svg+xml;utf8,%3Csvg xmlns='http://www.w3.org/2000/svg' width='24' height='24' viewBox='0 0 24 24' fill='none' stroke='rgba(255,255,255,0.6)' stroke-width='2'%3E%3Cpath d='M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z'/%3E%3Cpolyline points='3.27 6.96 12 12.01 20.73 6.96'/%3E%3Cline x1='12' y1='22.08' x2='12' y2='12'/%3E%3C/svg%3E") center / 24px no-repeat;
+}
+.pending-title {
+    color: #ffffff;
+    font-size: 24px;
+    font-weight: 700;
+    margin: 32px 0 24px 0;
+}
+</style>
+"""
+
+# ============================================================================
+# EXCEL I/O
+# ============================================================================
+
+def read_workbook(path):
+    """Stream the first sheet of a workbook into a DataFrame (read-only mode)"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        return pd.DataFrame(list(rows), columns=list(header))
+    finally:
+        wb.close()
+
+
+def write_workbook(df, path):
+    """Write a DataFrame row by row with a write-only workbook"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(list(df.columns))
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(path)
 
 # ============================================================================
 # DATA MANAGEMENT FUNCTIONS
 # ============================================================================
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_ml_recommendations(ml_weight=0.5):
     """Get ML recommendations for all products"""
     try:
@@ -29,60 +203,56 @@ def get_ml_recommendations(ml_weight=0.5):
         # Initialize ML engine
         engine = PricingEngine(ml_weight=ml_weight)
         
-        recommendations = []
-        for _, row in df.iterrows():
-            try:
-                base_price = float(row["Base_Price"])
-                cost = float(row.get("cost", base_price * 0.70))
-                competitor_avg = float(row.get("competitor_avg", base_price))
-                demand_index = float(row.get("demand_index", 1.0))
-                market_oos = bool(row.get("market_out_of_stock", False))
-                
-                rec = engine.get_recommendation(
-                    product_name=str(row["Product_Name"]),
-                    base_price=base_price,
-                    cost=cost,
-                    tier=str(row["Tier"]),
-                    category=str(row.get("Category", "Other")),
-                    lifecycle=str(row.get("Product_Lifecycle", "Maturity")),
-                    competitor_avg=competitor_avg,
-                    market_oos=market_oos,
-                    demand_index=demand_index
-                )
-                
-                # Calculate required approval level based on change percentage
-                change_pct = rec.get("price_change_pct", 0)
-                abs_change = abs(change_pct)
-                
-                if abs_change <= 3:
-                    approval_level = "Auto-Approved"
-                elif abs_change <= 7:
-                    approval_level = "Manager"
-                elif abs_change <= 15:
-                    approval_level = "Director"
-                else:
-                    approval_level = "Executive"
-                
-                recommendations.append({
-                    'ID': str(row["SKU"]),
-                    'Product': rec.get("product_name", ""),
-                    'Category': str(row.get("Category", "Other")),
-                    'Tier': str(row["Tier"]),
-                    'Current_Price': base_price,
-                    'New_Price': rec.get("recommended_price", base_price),
-                    'Change_Percent': change_pct,
-                    'Margin_Percent': rec.get("margin_pct", 0),
-                    'Competitor_Avg': competitor_avg,
-                    'Demand_Index': demand_index,
-                    'Required_Approval': approval_level,
-                    'Status': 'Pending',
-                    'Suggested_Date': datetime.now().strftime('%Y-%m-%d'),
-                    'Confidence': rec.get("confidence", {}).get("label", "Medium")
-                })
-            except:
-                continue
-        
-        return pd.DataFrame(recommendations)
+        # Coerce required numerics once; unusable rows are dropped with one mask
+        base_price = pd.to_numeric(df["Base_Price"], errors="coerce")
+        cost = pd.to_numeric(df.get("cost", base_price * 0.70), errors="coerce")
+        competitor_avg = pd.to_numeric(df.get("competitor_avg", base_price), errors="coerce")
+        demand_index = pd.to_numeric(df.get("demand_index", pd.Series(1.0, index=df.index)), errors="coerce")
+        
+        valid = (base_price > 0) & cost.notna() & competitor_avg.notna() & demand_index.notna()
+        df = df[valid].assign(
+            Base_Price=base_price[valid],
+            cost=cost[valid],
+            competitor_avg=competitor_avg[valid],
+            demand_index=demand_index[valid],
+        )
+        
+        df = df.assign(
+            Product_Name=df["Product_Name"].astype(str),
+            Tier=df["Tier"].astype(str),
+            Category=df["Category"].astype(str) if "Category" in df else "Other",
+            Product_Lifecycle=df["Product_Lifecycle"].astype(str) if "Product_Lifecycle" in df else "Maturity",
+            market_out_of_stock=df["market_out_of_stock"].astype(bool) if "market_out_of_stock" in df else False,
+        )
+        
+        # Score the whole catalogue in one batched engine call
+        recs = engine.get_recommendations_batch(df)
+        
+        # Calculate required approval level based on change percentage
+        change_pct = recs["price_change_pct"].to_numpy()
+        abs_change = np.abs(change_pct)
+        approval_level = np.select(
+            [abs_change <= 3, abs_change <= 7, abs_change <= 15],
+            ["Auto-Approved", "Manager", "Director"],
+            "Executive"
+        )
+        
+        return pd.DataFrame({
+            'ID': df["SKU"].astype(str).to_numpy(),
+            'Product': recs["product_name"].to_numpy(),
+            'Category': df["Category"].to_numpy(),
+            'Tier': df["Tier"].to_numpy(),
+            'Current_Price': df["Base_Price"].to_numpy(np.float64),
+            'New_Price': recs["recommended_price"].to_numpy(),
+            'Change_Percent': change_pct,
+            'Margin_Percent': recs["margin_pct"].to_numpy(),
+            'Competitor_Avg': df["competitor_avg"].to_numpy(np.float64),
+            'Demand_Index': df["demand_index"].to_numpy(np.float64),
+            'Required_Approval': approval_level,
+            'Status': 'Pending',
+            'Suggested_Date': datetime.now().strftime('%Y-%m-%d'),
+            'Confidence': 'Medium'
+        })
     
     except Exception as e:
         st.error(f"Error generating recommendations: {str(e)}")
@@ -100,59 +270,43 @@ def initialize_excel_files():
         if not recommendations_df.empty:
             # Filter only items that need approval (not auto-approved)
             pending_df = recommendations_df[recommendations_df['Required_Approval'] != 'Auto-Approved'].copy()
-            pending_df.to_excel(PENDING_FILE, index=False, engine='openpyxl')
+            write_workbook(pending_df, PENDING_FILE)
             print(f"Created {PENDING_FILE} with {len(pending_df)} items")
         else:
             # Create empty file if no recommendations
-            empty_data = {
-                'ID': [],
-                'Product': [],
-                'Category': [],
-                'Tier': [],
-                'Current_Price': [],
-                'New_Price': [],
-                'Change_Percent': [],
-                'Margin_Percent': [],
-                'Competitor_Avg': [],
-                'Demand_Index': [],
-                'Required_Approval': [],
-                'Status': [],
-                'Suggested_Date': [],
-                'Confidence': []
-            }
-            pd.DataFrame(empty_data).to_excel(PENDING_FILE, index=False, engine='openpyxl')
-    
-    # Initialize history file
-    if not os.path.exists(HISTORY_FILE):
-        history_data = {
-            'ID': [],
-            'Product': [],
-            'Category': [],
-            'Tier': [],
-            'Current_Price': [],
-            'New_Price': [],
-            'Change_Percent': [],
-            'Margin_Percent': [],
-            'Competitor_Avg': [],
-            'Demand_Index': [],
-            'Required_Approval': [],
-            'Status': [],
-            'Suggested_Date': [],
-            'Confidence': [],
-            'Action': [],
-            'Action_Date': [],
-            'Action_By': [],
-            'Notes': []
-        }
-        df = pd.DataFrame(history_data)
-        df.to_excel(HISTORY_FILE, index=False, engine='openpyxl')
-        print(f"Created {HISTORY_FILE}")
+            write_workbook(pd.DataFrame(columns=PENDING_COLUMNS), PENDING_FILE)
+    
+    # Initialize history partitions (migrating a single-file history if present)
+    if not os.path.isdir(HISTORY_DIR):
+        os.makedirs(HISTORY_DIR)
+        if os.path.exists(LEGACY_HISTORY_FILE):
+            legacy_df = read_workbook(LEGACY_HISTORY_FILE)
+            if not legacy_df.empty:
+                months = pd.to_datetime(legacy_df['Action_Date']).dt.strftime('%Y-%m')
+                for month, part in legacy_df.groupby(months):
+                    write_workbook(part, os.path.join(HISTORY_DIR, f"{month}.xlsx"))
+        print(f"Created {HISTORY_DIR}/")
+
+
+def history_partition_path(action_date):
+    """Partition workbook for an Action_Date string ('YYYY-MM-DD HH:MM:SS')"""
+    return os.path.join(HISTORY_DIR, f"{action_date[:7]}.xlsx")
+
+
+def append_history(entries):
+    """Append history entries (DataFrame) with one write per Action_Date month partition"""
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    for action_date, part in entries.groupby(entries['Action_Date'].str[:7]):
+        path = history_partition_path(action_date)
+        if os.path.exists(path):
+            part = pd.concat([read_workbook(path), part], ignore_index=True)
+        write_workbook(part[HISTORY_COLUMNS], path)
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_mock_data():
     """Get real data metrics from ML recommendations"""
     try:
-        df = get_product_data()
         recommendations_df = get_ml_recommendations(ml_weight=0.5)
         
         if recommendations_df.empty:
@@ -165,30 +319,34 @@ def get_mock_data():
                 'pending_review': 0
             }
         
+        # Pull each column out once and compute every metric on plain arrays
+        # (no filtered DataFrame copies, no helper columns on the frame)
+        margin = recommendations_df['Margin_Percent'].to_numpy(dtype=float)
+        current_price = recommendations_df['Current_Price'].to_numpy(dtype=float)
+        new_price = recommendations_df['New_Price'].to_numpy(dtype=float)
+        competitor_avg = recommendations_df['Competitor_Avg'].to_numpy(dtype=float)
+        n = margin.size
+        
         # 1. Average Profit Margin
-        avg_margin = recommendations_df['Margin_Percent'].mean()
+        avg_margin = margin.mean()
         
         # 2. % of recommendations with high confidence
-        high_confidence_count = len(recommendations_df[recommendations_df['Confidence'] == 'High Confidence'])
-        high_confidence_pct = (high_confidence_count / len(recommendations_df) * 100) if len(recommendations_df) > 0 else 0
+        high_confidence_count = np.count_nonzero(recommendations_df['Confidence'].to_numpy() == 'High Confidence')
+        high_confidence_pct = high_confidence_count / n * 100
         
         # 3. % of products with optimal pricing (within target margin range: 20-35%)
-        optimal_margin_count = len(recommendations_df[(recommendations_df['Margin_Percent'] >= 20) & 
-                                                       (recommendations_df['Margin_Percent'] <= 35)])
-        optimal_pricing_pct = (optimal_margin_count / len(recommendations_df) * 100) if len(recommendations_df) > 0 else 0
+        optimal_pricing_pct = np.count_nonzero((margin >= 20) & (margin <= 35)) / n * 100
         
         # 4. % of products with competitive positioning (within ±5% of competitor avg)
-        recommendations_df['Price_Diff_Pct'] = ((recommendations_df['New_Price'] - recommendations_df['Competitor_Avg']) / 
-                                                 recommendations_df['Competitor_Avg'] * 100).abs()
-        competitive_count = len(recommendations_df[recommendations_df['Price_Diff_Pct'] <= 5])
-        competitive_positioning_pct = (competitive_count / len(recommendations_df) * 100) if len(recommendations_df) > 0 else 0
+        price_diff_pct = np.abs((new_price - competitor_avg) / competitor_avg * 100)
+        competitive_positioning_pct = np.count_nonzero(price_diff_pct <= 5) / n * 100
         
         # 5. Margin improvement (compare current vs recommended)
-        total_current_revenue = recommendations_df['Current_Price'].sum()
-        total_new_revenue = recommendations_df['New_Price'].sum()
+        total_current_revenue = current_price.sum()
+        total_new_revenue = new_price.sum()
         revenue_change = ((total_new_revenue - total_current_revenue) / total_current_revenue * 100) if total_current_revenue > 0 else 0
         
-        pending_count = len(recommendations_df[recommendations_df['Status'] == 'Pending'])
+        pending_count = int(np.count_nonzero(recommendations_df['Status'].to_numpy() == 'Pending'))
         
         return {
             'avg_profit_margin': round(avg_margin, 1),
@@ -210,155 +368,111 @@ def get_mock_data():
         }
 
 
-def get_pending_approvals():
-    """Get pending approval items from Excel"""
+def pending_file_version():
+    """Modification time of the pending workbook; the same for every session"""
+    return os.path.getmtime(PENDING_FILE) if os.path.exists(PENDING_FILE) else None
+
+
+def history_files_version():
+    """(path, modification time) of every history partition; the same for every session"""
+    paths = sorted(glob.glob(os.path.join(HISTORY_DIR, "*.xlsx")))
+    return tuple((path, os.path.getmtime(path)) for path in paths)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_pending_approvals(pending_version=None):
+    """Get pending approval items from Excel (cached per pending_file_version())"""
     try:
         initialize_excel_files()
-        df = pd.read_excel(PENDING_FILE, engine='openpyxl')
+        df = read_workbook(PENDING_FILE)
         return df[df['Status'] == 'Pending']
     except Exception as e:
         st.error(f"Error reading pending approvals: {str(e)}")
         return pd.DataFrame()
 
 
-def get_workflow_stats():
-    """Calculate workflow statistics from pending items"""
-    df = get_pending_approvals()
-    
-    if df.empty:
-        return {
-            'ai_auto_approve': 0,
-            'manager_pending': 0,
-            'director_pending': 0,
-            'executive_pending': 0
-        }
-    
-    # Calculate absolute change percentages
-    df['Abs_Change'] = df['Change_Percent'].abs()
-    
-    # Categorize by change percentage
-    auto_approve = len(df[df['Abs_Change'] <= 3])
-    manager = len(df[(df['Abs_Change'] > 3) & (df['Abs_Change'] <= 7)])
-    director = len(df[(df['Abs_Change'] > 7) & (df['Abs_Change'] <= 15)])
-    executive = len(df[df['Abs_Change'] > 15])
-    
-    return {
-        'ai_auto_approve': auto_approve,
-        'manager_pending': manager,
-        'director_pending': director,
-        'executive_pending': executive
-    }
-
-
-def approve_item(item_id, approved_by="User", notes=""):
-    """Approve an item and move it to history"""
+def decide_items(item_ids, action, action_by="User", notes=""):
+    """Move items to history as 'Approved'/'Rejected' with a single pending
+    read/write and one write per history partition"""
     try:
         # Read pending file
-        pending_df = pd.read_excel(PENDING_FILE, engine='openpyxl')
+        pending_df = read_workbook(PENDING_FILE)
         
-        # Find the item
-        item_mask = pending_df['ID'] == item_id
+        # Find the items
+        item_mask = pending_df['ID'].isin(item_ids)
         if not item_mask.any():
             return False, "Item not found"
         
-        # Get item details
-        item = pending_df[item_mask].iloc[0].to_dict()
+        # Decided rows stay in the file until the next refresh; never decide them twice
+        item_mask &= pending_df['Status'] == 'Pending'
+        if not item_mask.any():
+            return False, "Already decided" if len(item_ids) == 1 else "Items already decided"
+        
+        # Get item details (fill columns older files may lack)
+        items = pending_df[item_mask].copy()
+        for column, default in ITEM_DEFAULTS.items():
+            if column not in items:
+                items[column] = default
         
         # Update status in pending file
-        pending_df.loc[item_mask, 'Status'] = 'Approved'
-        pending_df.to_excel(PENDING_FILE, index=False, engine='openpyxl')
+        pending_df.loc[item_mask, 'Status'] = action
+        write_workbook(pending_df, PENDING_FILE)
         
         # Add to history
-        history_df = pd.read_excel(HISTORY_FILE, engine='openpyxl')
-        
-        history_entry = {
-            'ID': item['ID'],
-            'Product': item['Product'],
-            'Category': item.get('Category', ''),
-            'Tier': item.get('Tier', ''),
-            'Current_Price': item['Current_Price'],
-            'New_Price': item['New_Price'],
-            'Change_Percent': item['Change_Percent'],
-            'Margin_Percent': item.get('Margin_Percent', 0),
-            'Competitor_Avg': item.get('Competitor_Avg', 0),
-            'Demand_Index': item.get('Demand_Index', 1.0),
-            'Required_Approval': item['Required_Approval'],
-            'Status': 'Approved',
-            'Suggested_Date': item['Suggested_Date'],
-            'Confidence': item.get('Confidence', ''),
-            'Action': 'Approved',
-            'Action_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Action_By': approved_by,
-            'Notes': notes if notes else 'Approved'
-        }
-        
-        history_df = pd.concat([history_df, pd.DataFrame([history_entry])], ignore_index=True)
-        history_df.to_excel(HISTORY_FILE, index=False, engine='openpyxl')
-        
-        return True, f"Approved {item['Product']}"
+        history_entries = items.assign(
+            Status=action,
+            Action=action,
+            Action_Date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            Action_By=action_by,
+            Notes=notes if notes else action
+        )
+        append_history(history_entries)
+        
+        if len(items) == 1:
+            return True, f"{action} {items['Product'].iloc[0]}"
+        return True, f"{action} {len(items)} items"
         
     except Exception as e:
         return False, f"Error: {str(e)}"
 
 
+def approve_items(item_ids, approved_by="User", notes=""):
+    """Approve several items and move them to history in one pass"""
+    return decide_items(item_ids, 'Approved', action_by=approved_by, notes=notes)
+
+
+def reject_items(item_ids, rejected_by="User", notes=""):
+    """Reject several items and move them to history in one pass"""
+    return decide_items(item_ids, 'Rejected', action_by=rejected_by, notes=notes)
+
+
+def approve_item(item_id, approved_by="User", notes=""):
+    """Approve an item and move it to history"""
+    return approve_items([item_id], approved_by=approved_by, notes=notes)
+
+
 def reject_item(item_id, rejected_by="User", notes=""):
     """Reject an item and move it to history"""
-    try:
-        # Read pending file
-        pending_df = pd.read_excel(PENDING_FILE, engine='openpyxl')
-        
-        # Find the item
-        item_mask = pending_df['ID'] == item_id
-        if not item_mask.any():
-            return False, "Item not found"
-        
-        # Get item details
-        item = pending_df[item_mask].iloc[0].to_dict()
-        
-        # Update status in pending file
-        pending_df.loc[item_mask, 'Status'] = 'Rejected'
-        pending_df.to_excel(PENDING_FILE, index=False, engine='openpyxl')
-        
-        # Add to history
-        history_df = pd.read_excel(HISTORY_FILE, engine='openpyxl')
-        
-        history_entry = {
-            'ID': item['ID'],
-            'Product': item['Product'],
-            'Category': item.get('Category', ''),
-            'Tier': item.get('Tier', ''),
-            'Current_Price': item['Current_Price'],
-            'New_Price': item['New_Price'],
-            'Change_Percent': item['Change_Percent'],
-            'Margin_Percent': item.get('Margin_Percent', 0),
-            'Competitor_Avg': item.get('Competitor_Avg', 0),
-            'Demand_Index': item.get('Demand_Index', 1.0),
-            'Required_Approval': item['Required_Approval'],
-            'Status': 'Rejected',
-            'Suggested_Date': item['Suggested_Date'],
-            'Confidence': item.get('Confidence', ''),
-            'Action': 'Rejected',
-            'Action_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Action_By': rejected_by,
-            'Notes': notes if notes else 'Rejected'
-        }
-        
-        history_df = pd.concat([history_df, pd.DataFrame([history_entry])], ignore_index=True)
-        history_df.to_excel(HISTORY_FILE, index=False, engine='openpyxl')
-        
-        return True, f"Rejected {item['Product']}"
-        
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+    return reject_items([item_id], rejected_by=rejected_by, notes=notes)
 
 
-def get_history_data():
-    """Get approval history from Excel"""
+@st.cache_data(ttl=60, show_spinner=False)
+def get_history_data(year=None, month=None, history_version=()):
+    """
+    Get approval history, reading only the partitions for the requested window.
+    history_version (from history_files_version()) only keys the cache.
+    """
     try:
-        if not os.path.exists(HISTORY_FILE):
+        if not os.path.isdir(HISTORY_DIR):
             initialize_excel_files()
-        df = pd.read_excel(HISTORY_FILE, engine='openpyxl')
-        return df
+        
+        year_part = f"{int(year):04d}" if year else "*"
+        month_part = f"{int(month):02d}" if month else "*"
+        paths = sorted(glob.glob(os.path.join(HISTORY_DIR, f"{year_part}-{month_part}.xlsx")))
+        
+        if not paths:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return pd.concat([read_workbook(path) for path in paths], ignore_index=True)
     except Exception as e:
         st.error(f"Error reading history: {str(e)}")
         return pd.DataFrame()
@@ -373,6 +487,30 @@ def export_to_excel(df, filename):
     return output.getvalue()
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def build_all_exports(pending_version=None, history_version=()):
+    """Serialize the pending, history and combined workbooks once per file version"""
+    pending_df = get_pending_approvals(pending_version)
+    history_df = get_history_data(history_version=history_version)
+    exports = {'pending': None, 'history': None, 'combined': None}
+    
+    if not pending_df.empty:
+        exports['pending'] = export_to_excel(pending_df, "pending_approvals.xlsx")
+    if not history_df.empty:
+        exports['history'] = export_to_excel(history_df, "approval_history.xlsx")
+    
+    if not pending_df.empty or not history_df.empty:
+        output = BytesIO()
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            if not pending_df.empty:
+                pending_df.to_excel(writer, sheet_name='Pending', index=False)
+            if not history_df.empty:
+                history_df.to_excel(writer, sheet_name='History', index=False)
+        exports['combined'] = output.getvalue()
+    
+    return exports
+
+
 def refresh_pending_from_ml():
     """Refresh pending approvals with new ML recommendations"""
     try:
@@ -386,7 +524,7 @@ def refresh_pending_from_ml():
         new_pending = new_recs[new_recs['Required_Approval'] != 'Auto-Approved'].copy()
         
         # Read existing pending items
-        existing_df = pd.read_excel(PENDING_FILE, engine='openpyxl')
+        existing_df = read_workbook(PENDING_FILE)
         
         # Get items that are still pending (not yet approved/rejected)
         still_pending = existing_df[existing_df['Status'] == 'Pending']
@@ -396,7 +534,7 @@ def refresh_pending_from_ml():
         combined = combined.drop_duplicates(subset=['ID'], keep='first')
         
         # Save back
-        combined.to_excel(PENDING_FILE, index=False, engine='openpyxl')
+        write_workbook(combined, PENDING_FILE)
         
         new_count = len(combined) - len(still_pending)
         return True, f"Added {new_count} new recommendations"
@@ -405,6 +543,126 @@ def refresh_pending_from_ml():
         return False, f"Error refreshing: {str(e)}"
 
 
+def prepare_exports(data_version):
+    """Export callback: build the workbooks for this file version"""
+    st.session_state.export_ready_version = data_version
+
+
+def set_approval_page(page):
+    """Pager callback"""
+    st.session_state.approval_page = page
+
+
+def handle_bulk_decision(action, page_ids):
+    """Form submit callback: approve/reject every selected item on the page"""
+    selected = [item_id for item_id in page_ids if st.session_state.get(f"sel_{item_id}")]
+    if not selected:
+        st.session_state.decision_messages.append("No items selected")
+        return
+    
+    username = st.session_state.get('username', 'User')
+    if action == 'approve':
+        success, message = approve_items(selected, approved_by=username)
+    else:
+        success, message = reject_items(selected, rejected_by=username)
+    
+    if success:
+        st.session_state.decided_ids.update(selected)
+    st.session_state.decision_messages.append(message)
+
+
+def flush_decision_messages():
+    """Show confirmations queued by the decision callbacks"""
+    for message in st.session_state.decision_messages:
+        st.toast(message)
+    st.session_state.decision_messages = []
+
+
+def card_display_frame(page_items):
+    """Card columns plus the formatted/derived display fields, computed column-wise"""
+    change = page_items['Change_Percent'].astype(float)
+    positive = (change >= 0).to_numpy()
+    return page_items[CARD_COLUMNS].assign(
+        Change_Text=np.where(positive, '+', '') + change.map('{:.1f}'.format).to_numpy(),
+        Change_Color=np.where(positive, '#10b981', '#ef4444'),
+        Confidence_Color=page_items['Confidence'].map(CONFIDENCE_COLORS).fillna('#9ca3af'),
+        Current_Text=page_items['Current_Price'].map('${:.2f}'.format),
+        New_Text=page_items['New_Price'].map('${:.2f}'.format),
+    )
+
+
+def build_pending_card(row, number):
+    """HTML for one pending card (row from card_display_frame)"""
+    return f"""
+    <div style="background-color: rgb(41, 21, 25); border: 1px solid rgba(255, 255, 255, 0.08);
+                border-radius: 12px; padding: 20px 24px; margin-bottom: 16px;
+                display: flex; align-items: center; gap: 16px;">
+        <div class="pkg-icon"></div>
+        <div style="flex: 1;">
+            <div style="color: white; font-size: 18px; font-weight: 600; margin-bottom: 6px;">
+                <span style="color: rgba(255, 255, 255, 0.4);">#{number}</span> {row.Product}
+            </div>
+            <p style="margin: 0; color: #ccc;">
+                <span style="color: rgba(255, 255, 255, 0.5);">{row.Current_Text}</span>
+                <span style="color: rgba(255, 255, 255, 0.4); margin: 0 8px;">→</span>
+                <span style="color: white; font-weight: 600;">{row.New_Text}</span>
+                <span style="color: {row.Change_Color}; margin-left: 12px; font-weight: bold;">
+                    ({row.Change_Text}%)
+                </span>
+                <span style="margin-left: 16px; font-size: 12px; color: rgba(255,255,255,0.5);">
+                    Requires: {row.Required_Approval}
+                </span>
+                <span style="margin-left: 12px; font-size: 12px; color: {row.Confidence_Color};">
+                    • {row.Confidence}
+                </span>
+            </p>
+        </div>
+    </div>
+"""
+
+
+@st.fragment
+def render_pending_page(page_items, first_number):
+    """Render a page of cards as one HTML block inside a selection form.
+    Submitting reruns only this fragment, once for the whole batch."""
+    flush_decision_messages()
+    
+    rows = [
+        (number, row)
+        for number, row in enumerate(card_display_frame(page_items).itertuples(name='Row'), start=first_number)
+        if row.ID not in st.session_state.decided_ids
+    ]
+    page_ids = [row.ID for _, row in rows]
+    
+    with st.form("bulk_approval", border=False):
+        st.markdown("".join(build_pending_card(row, number) for number, row in rows), unsafe_allow_html=True)
+        
+        # Checkbox changes inside the form don't rerun until submit
+        select_cols = st.columns(5)
+        for position, (number, row) in enumerate(rows):
+            with select_cols[position % 5]:
+                st.checkbox(f"#{number}", key=f"sel_{row.ID}")
+        
+        col_approve, col_reject = st.columns(2)
+        with col_approve:
+            st.form_submit_button("Approve selected", type="primary", use_container_width=True,
+                                  on_click=handle_bulk_decision, args=('approve', page_ids))
+        with col_reject:
+            st.form_submit_button("Reject selected", use_container_width=True,
+                                  on_click=handle_bulk_decision, args=('reject', page_ids))
+
+
+def render_refresh_button():
+    """Pull fresh ML recommendations into the pending queue"""
+    if st.button("Refresh Data", use_container_width=True):
+        success, message = refresh_pending_from_ml()
+        if success:
+            st.success(message)
+        else:
+            st.warning(message)
+        st.rerun()
+
+
 # ============================================================================
 # UI RENDERING
 # ============================================================================
@@ -419,154 +677,62 @@ def render():
     if 'approval_filter' not in st.session_state:
         st.session_state.approval_filter = 'All'
     
-    # Custom CSS
-    st.markdown("""
-    <style>
-        .metric-card {
-            background: linear-gradient(135deg, rgba(236, 72, 153, 0.1) 0%, rgba(190, 24, 93, 0.05) 100%);
-            border: 1px solid rgba(236, 72, 153, 0.2);
-            border-radius: 16px;
-            padding: 24px;
-            text-align: center;
-        }
-        .metric-value {
-            font-size: 36px;
-            font-weight: 700;
-            color: #ec4899;
-            margin: 8px 0;
-        }
-        .metric-label {
-            color: rgba(255, 255, 255, 0.7);
-            font-size: 14px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        .metric-delta {
-            color: #10b981;
-            font-size: 14px;
-            font-weight: 600;
-            margin-top: 4px;
-        }
-        .workflow-container-new {
-            background: rgba(30, 20, 25, 0.8);
-            border: 1px solid rgba(255, 255, 255, 0.08);
-            border-radius: 16px;
-            padding: 32px;
-            margin: 24px 0;
-        }
-        .workflow-title-new {
-            color: #ffffff;
-            font-size: 20px;
-            font-weight: 600;
-            margin-bottom: 24px;
-        }
-        .workflow-steps-new {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            gap: 16px;
-        }
-        .workflow-step-new {
-            flex: 1;
-            text-align: center;
-        }
-        .workflow-circle {
-            width: 80px;
-            height: 80px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 28px;
-            font-weight: 700;
-            margin: 0 auto 12px;
-            border: 3px solid;
-        }
-        .circle-green {
-            background: rgba(16, 185, 129, 0.15);
-            border-color: #10b981;
-            color: #10b981;
-        }
-        .circle-pink {
-            background: rgba(236, 72, 153, 0.15);
-            border-color: #ec4899;
-            color: #ec4899;
-        }
-        .circle-gray {
-            background: rgba(156, 163, 175, 0.15);
-            border-color: #9ca3af;
-            color: #9ca3af;
-        }
-        .workflow-label {
-            font-size: 16px;
-            font-weight: 600;
-            color: rgba(255, 255, 255, 0.9);
-            margin-bottom: 4px;
-        }
-        .workflow-description {
-            font-size: 13px;
-            color: rgba(255, 255, 255, 0.5);
-        }
-        .workflow-count {
-            font-size: 13px;
-            color: rgba(255, 255, 255, 0.6);
-            margin-top: 4px;
-        }
-        .pending-badge-new {
-            display: inline-block;
-            background: rgba(236, 72, 153, 0.2);
-            color: #ec4899;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 600;
-            margin-top: 8px;
-        }
-        .pending-title {
-            color: #ffffff;
-            font-size: 24px;
-            font-weight: 700;
-            margin: 32px 0 24px 0;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    # Items decided in the page fragment since the last full run; confirmations
+    # not yet shown by the fragment are flushed here
+    st.session_state.setdefault('decision_messages', [])
+    flush_decision_messages()
+    st.session_state.decided_ids = set()
     
+    # Cached reads and exports are shared by all sessions, so they are keyed on
+    # the files themselves; any approve/reject/refresh changes these
+    data_version = (pending_file_version(), history_files_version())
     
-    # Get metrics
-    metrics = get_mock_data()
+    # Read each dataset once per run and reuse it below
+    pending_df = get_pending_approvals(data_version[0])
+    history_df = get_history_data(history_version=data_version[1])
+    action_counts = history_df['Action'].value_counts() if 'Action' in history_df else pd.Series(dtype=int)
     
-    # Metrics row - only 3 cards now
-    col1, col2, col3 = st.columns(3)
+    # Per-level queue counts drive the workflow circles and the section title
+    approval_counts = (pending_df['Required_Approval'].value_counts().to_dict()
+                       if 'Required_Approval' in pending_df else {})
     
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">High Confidence Recommendations</div>
-            <div class="metric-value">{metrics['high_confidence_pct']:.1f}%</div>
-            <div class="metric-delta">{metrics['pending_review']} pending review</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # Custom CSS (re-emitted every run: Streamlit drops elements a run doesn't re-send)
+    st.markdown(_APPROVALS_CSS, unsafe_allow_html=True)
     
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Optimal Pricing</div>
-            <div class="metric-value">{metrics['optimal_pricing_pct']:.1f}%</div>
-            <div class="metric-delta">Within 20-35% margin range</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # Nothing queued and nothing processed yet: skip metrics, workflow and exports
+    if pending_df.empty and history_df.empty:
+        st.info("Your approval queue is clear! No action required.")
+        render_refresh_button()
+        return
     
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">Competitive Positioning</div>
-            <div class="metric-value">{metrics['competitive_positioning_pct']:.1f}%</div>
-            <div class="metric-delta">Within ±5% of competitors</div>
-        </div>
-        """, unsafe_allow_html=True)
+    
+    # Get metrics
+    metrics = get_mock_data()
+    
+    # Metrics row - only 3 cards now, emitted as one block
+    metric_specs = [
+        ("High Confidence Recommendations", f"{metrics['high_confidence_pct']:.1f}%", f"{metrics['pending_review']} pending review"),
+        ("Optimal Pricing", f"{metrics['optimal_pricing_pct']:.1f}%", "Within 20-35% margin range"),
+        ("Competitive Positioning", f"{metrics['competitive_positioning_pct']:.1f}%", "Within ±5% of competitors"),
+    ]
+    metric_cards = "".join(
+        f"""
+        <div class="metric-card" style="flex: 1;">
+            <div class="metric-label">{label}</div>
+            <div class="metric-value">{value}</div>
+            <div class="metric-delta">{delta}</div>
+        </div>"""
+        for label, value, delta in metric_specs
+    )
+    st.markdown(f'<div style="display: flex; gap: 16px;">{metric_cards}</div>', unsafe_allow_html=True)
     
     # Workflow visualization with clickable circles
-    workflow = get_workflow_stats()
+    workflow = {
+        'ai_auto_approve': approval_counts.get('Auto-Approved', 0),
+        'manager_pending': approval_counts.get('Manager', 0),
+        'director_pending': approval_counts.get('Director', 0),
+        'executive_pending': approval_counts.get('Executive', 0)
+    }
     
     st.markdown(f"""
     <div class="workflow-container-new">
@@ -600,95 +766,61 @@ def render():
     </div>
     """, unsafe_allow_html=True)
     
-    # Clickable buttons below circles
-    st.markdown("<div style='margin-top: -20px; margin-bottom: 20px;'>", unsafe_allow_html=True)
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button(" AI Auto", key="filter_auto", use_container_width=True, 
-                     type="primary" if st.session_state.approval_filter == 'Auto-Approved' else "secondary"):
-            st.session_state.approval_filter = 'Auto-Approved'
-            st.rerun()
-    
-    with col2:
-        if st.button("Manager", key="filter_manager", use_container_width=True,
-                     type="primary" if st.session_state.approval_filter == 'Manager' else "secondary"):
-            st.session_state.approval_filter = 'Manager'
-            st.rerun()
-    
-    with col3:
-        if st.button("Director", key="filter_director", use_container_width=True,
-                     type="primary" if st.session_state.approval_filter == 'Director' else "secondary"):
-            st.session_state.approval_filter = 'Director'
-            st.rerun()
-    
-    with col4:
-        if st.button(" Executive", key="filter_executive", use_container_width=True,
-                     type="primary" if st.session_state.approval_filter == 'Executive' else "secondary"):
-            st.session_state.approval_filter = 'Executive'
-            st.rerun()
-    
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Filter below circles
+    st.radio(
+        "Filter",
+        options=['All', 'Auto-Approved', 'Manager', 'Director', 'Executive'],
+        horizontal=True,
+        key='approval_filter',
+        label_visibility='collapsed',
+        on_change=set_approval_page,
+        args=(0,)
+    )
     
     # Action buttons row
     st.markdown("---")
-    col1, col2, col3, col4, col5 = st.columns(5)
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # Export workbooks are only serialized after the user asks for them, and
+    # only for the file version they were requested for
+    export_ready = st.session_state.get('export_ready_version') == data_version
+    has_export_data = not pending_df.empty or not history_df.empty
+    exports = build_all_exports(*data_version) if export_ready else {}
     
     with col1:
-        if st.button("Refresh Data", use_container_width=True):
-            success, message = refresh_pending_from_ml()
-            if success:
-                st.success(message)
-            else:
-                st.warning(message)
-            st.rerun()
+        render_refresh_button()
     
     with col2:
-        if st.button("Show All", use_container_width=True):
-            st.session_state.approval_filter = 'All'
-            st.rerun()
-    
-    with col3:
         # Export pending items
-        pending_df = get_pending_approvals()
-        if not pending_df.empty:
-            excel_data = export_to_excel(pending_df, "pending_approvals.xlsx")
+        if not export_ready and has_export_data:
+            st.button("Prepare Exports", use_container_width=True,
+                      on_click=prepare_exports, args=(data_version,))
+        elif exports.get('pending'):
             st.download_button(
                 label="Export Pending",
-                data=excel_data,
+                data=exports['pending'],
                 file_name=f"pending_approvals_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
     
-    with col4:
+    with col3:
         # Export history
-        history_df = get_history_data()
-        if not history_df.empty:
-            excel_data = export_to_excel(history_df, "approval_history.xlsx")
+        if exports.get('history'):
             st.download_button(
                 label="Export History",
-                data=excel_data,
+                data=exports['history'],
                 file_name=f"approval_history_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
     
-    with col5:
+    with col4:
         # Export combined report
-        if not pending_df.empty or not history_df.empty:
-            # Create combined report
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                if not pending_df.empty:
-                    pending_df.to_excel(writer, sheet_name='Pending', index=False)
-                if not history_df.empty:
-                    history_df.to_excel(writer, sheet_name='History', index=False)
-            output.seek(0)
-            
+        if exports.get('combined'):
             st.download_button(
                 label=" Export All",
-                data=output,
+                data=exports['combined'],
                 file_name=f"approval_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -697,123 +829,62 @@ def render():
     st.markdown("---")
     
     # Pending Review Section with Filtering
-    pending_items = get_pending_approvals()
+    pending_items = pending_df
     
     # Apply filter based on selected approval level
     if st.session_state.approval_filter != 'All':
-        pending_items = pending_items[pending_items['Required_Approval'] == st.session_state.approval_filter]
+        groups = pending_items.groupby('Required_Approval', sort=False)
+        if st.session_state.approval_filter in groups.groups:
+            pending_items = groups.get_group(st.session_state.approval_filter)
+        else:
+            pending_items = pending_items.iloc[:0]
     
-    total_pending = len(pending_items)
+    total_all = sum(approval_counts.values())
+    total_pending = total_all if st.session_state.approval_filter == 'All' else approval_counts.get(st.session_state.approval_filter, 0)
     
     # Display filter status
     filter_text = f" - {st.session_state.approval_filter}" if st.session_state.approval_filter != 'All' else ""
     st.markdown(f'<div class="pending-title">Pending Your Review ({total_pending}){filter_text}</div>', unsafe_allow_html=True)
     
-    if pending_items.empty:
+    if total_pending == 0:
         st.info("Your approval queue is clear! No action required.")
         
         # Show history summary
-        history_df = get_history_data()
         if not history_df.empty:
             st.markdown("### Recent Activity")
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Total Processed", len(history_df))
             with col2:
-                approved = len(history_df[history_df['Action'] == 'Approved'])
-                st.metric("Approved", approved)
+                st.metric("Approved", int(action_counts.get('Approved', 0)))
             with col3:
-                rejected = len(history_df[history_df['Action'] == 'Rejected'])
-                st.metric("Rejected", rejected)
+                st.metric("Rejected", int(action_counts.get('Rejected', 0)))
         
         return
     
-    # Display each pending item
-    for index, row in pending_items.iterrows():
-        change_val = float(row['Change_Percent'])
-        change_class = "positive" if change_val >= 0 else "negative"
-        change_sign = "+" if change_val >= 0 else ""
-        
-        # Create unique key using both index and ID
-        unique_key = f"{index}_{row['ID']}"
-        
-        # Create card and buttons
-        col_card, col_buttons = st.columns([3, 1])
-        
-        with col_card:
-            confidence_color = {
-                'High Confidence': '#10b981',
-                'Review Suggested': '#f59e0b',
-                'Needs Review': '#ef4444'
-            }.get(row.get('Confidence', 'Medium'), '#9ca3af')
-            
-            st.markdown(f"""
-            <div style="background-color: rgb(41, 21, 25); border: 1px solid rgba(255, 255, 255, 0.08);
-                        border-radius: 12px; padding: 20px 24px; margin-bottom: 16px;
-                        display: flex; align-items: center; gap: 16px;">
-                <div style="width: 48px; height: 48px; background: rgba(255, 255, 255, 0.05);
-                            border-radius: 10px; display: flex; align-items: center; 
-                            justify-content: center; flex-shrink: 0;">
-                    <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" 
-                         fill="none" stroke="rgba(255,255,255,0.6)" stroke-width="2">
-                        <path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path>
-                        <polyline points="3.27 6.96 12 12.01 20.73 6.96"></polyline>
-                        <line x1="12" y1="22.08" x2="12" y2="12"></line>
-                    </svg>
-                </div>
-                <div style="flex: 1;">
-                    <div style="color: white; font-size: 18px; font-weight: 600; margin-bottom: 6px;">
-                        {row['Product']}
-                    </div>
-                    <p style="margin: 0; color: #ccc;">
-                        <span style="color: rgba(255, 255, 255, 0.5);">${row['Current_Price']:.2f}</span>
-                        <span style="color: rgba(255, 255, 255, 0.4); margin: 0 8px;">→</span>
-                        <span style="color: white; font-weight: 600;">${row['New_Price']:.2f}</span>
-                        <span style="color: {'#10b981' if change_val >= 0 else '#ef4444'}; margin-left: 12px; font-weight: bold;">
-                            ({change_sign}{change_val:.1f}%)
-                        </span>
-                        <span style="margin-left: 16px; font-size: 12px; color: rgba(255,255,255,0.5);">
-                            Requires: {row['Required_Approval']}
-                        </span>
-                        <span style="margin-left: 12px; font-size: 12px; color: {confidence_color};">
-                            • {row.get('Confidence', 'Medium')}
-                        </span>
-                    </p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_buttons:
-            st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
-            btn_col1, btn_col2 = st.columns(2)
-            
-            with btn_col1:
-                if st.button("Approve", key=f"approve_{unique_key}", type="primary", use_container_width=True):
-                    username = st.session_state.get('username', 'User')
-                    success, message = approve_item(row['ID'], approved_by=username)
-                    
-                    if success:
-                        st.success(f"{message}")
-                        st.rerun()
-                    else:
-                        st.error(f" {message}")
-            
-            with btn_col2:
-                if st.button(" Reject", key=f"reject_{unique_key}", use_container_width=True):
-                    username = st.session_state.get('username', 'User')
-                    success, message = reject_item(row['ID'], rejected_by=username)
-                    
-                    if success:
-                        st.warning(f" {message}")
-                        st.rerun()
-                    else:
-                        st.error(f" {message}")
+    # Display only the current page of pending items
+    page_count = -(-total_pending // PAGE_SIZE)
+    page = min(st.session_state.get('approval_page', 0), page_count - 1)
+    page_items = pending_items.iloc[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    
+    render_pending_page(page_items, page * PAGE_SIZE + 1)
+    
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("← Previous", key="approval_prev_page", disabled=page == 0, use_container_width=True,
+                      on_click=set_approval_page, args=(page - 1,))
+        with col_page:
+            st.markdown(f"<div style='text-align: center; padding-top: 8px;'>Page {page + 1} of {page_count}</div>",
+                        unsafe_allow_html=True)
+        with col_next:
+            st.button("Next →", key="approval_next_page", disabled=page >= page_count - 1, use_container_width=True,
+                      on_click=set_approval_page, args=(page + 1,))
     
     # Show history summary at bottom
     st.markdown("---")
     st.markdown("### Approval History Summary")
     
-    history_df = get_history_data()
     if not history_df.empty:
         col1, col2, col3, col4 = st.columns(4)
         
@@ -821,11 +892,11 @@ def render():
             st.metric("Total Processed", len(history_df))
         
         with col2:
-            approved = len(history_df[history_df['Action'] == 'Approved'])
+            approved = int(action_counts.get('Approved', 0))
             st.metric("Approved", approved, delta=f"{(approved/len(history_df)*100):.1f}%")
         
         with col3:
-            rejected = len(history_df[history_df['Action'] == 'Rejected'])
+            rejected = int(action_counts.get('Rejected', 0))
             st.metric("Rejected", rejected, delta=f"{(rejected/len(history_df)*100):.1f}%")
         
         with col4:
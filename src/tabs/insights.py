@@ -8,10 +8,163 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import numpy as np
+from string import Template
 
 # Import your modules
 from data_loader import get_product_data
-from ml_engine import get_pricing_engine, TIER_CONFIGS
+from ml_engine import PricingEngine, TIER_CONFIGS
+
+rng = np.random.default_rng()
+
+# Hero KPI card markup, compiled once; render() only substitutes the values
+_REVENUE_CARD = Template("""
+    <div class="metric-card">
+        <div class="metric-icon green">
+            <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
+                <line x1="12" y1="2" x2="12" y2="22"></line>
+                <path d="M17 5H9.5a3.5 3.5 0 0 0 0 7h5a3.5 3.5 0 0 1 0 7H6"></path>
+            </svg>
+        </div>
+        <div class="metric-label">Potential Revenue</div>
+        <div class="metric-value">$$$revenue</div>
+        <div class="metric-change">
+            <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
+                <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
+                <polyline points="17 6 23 6 23 12"></polyline>
+            </svg>
+            +$uplift% vs current pricing
+        </div>
+    </div>
+""")
+
+_MARGIN_CARD = Template("""
+    <div class="metric-card">
+        <div class="metric-icon pink">
+            <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
+                <polyline points="22 12 18 12 15 21 9 3 6 12 2 12"></polyline>
+            </svg>
+        </div>
+        <div class="metric-label">Avg Profit Margin</div>
+        <div class="metric-value">$margin%</div>
+        <div class="metric-change">
+            <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
+                <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
+                <polyline points="17 6 23 6 23 12"></polyline>
+            </svg>
+            AI-optimized margins
+        </div>
+    </div>
+""")
+
+_PRODUCTS_CARD = Template("""
+    <div class="metric-card">
+        <div class="metric-icon magenta">
+            <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
+                <path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path>
+            </svg>
+        </div>
+        <div class="metric-label">Active Products</div>
+        <div class="metric-value">$products</div>
+        <div class="metric-change" style="color: #F48FB1;">
+            $tagged with smart tags
+        </div>
+    </div>
+""")
+
+_ADJUSTMENTS_CARD = Template("""
+    <div class="metric-card">
+        <div class="metric-icon gold">
+            <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
+                <polygon points="13 2 3 14 12 14 11 22 21 10 12 10 13 2"></polygon>
+            </svg>
+        </div>
+        <div class="metric-label">Price Adjustments</div>
+        <div class="metric-value">$adjustments</div>
+        <div class="metric-change">
+            <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
+                <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
+                <polyline points="17 6 23 6 23 12"></polyline>
+            </svg>
+            ↑$increases ↓$decreases recommended
+        </div>
+    </div>
+""")
+
+@st.cache_resource  # Cache engine instance
+def get_engine(ml_weight=0.5):
+    """Get the pricing engine, trained once per ML weight"""
+    return PricingEngine(ml_weight=ml_weight)
+
+def default_recommendations(products_df):
+    """Base-price recommendations for products the engine can't score"""
+    base = products_df['Base_Price'].to_numpy(np.float64)
+    cost = products_df['cost'].to_numpy(np.float64)
+    safe_base = np.where(base > 0, base, 1.0)
+    return pd.DataFrame({
+        'product_name': products_df['Product_Name'].to_numpy(object),
+        'recommended_price': base,
+        'rules_price': base,
+        'ml_price': base,
+        'ml_adjustment_pct': 0.0,
+        'price_change_pct': 0.0,
+        'margin_pct': np.where(base > 0, (base - cost) / safe_base * 100, 0.0),
+        'smart_tags': [[] for _ in range(len(products_df))],
+        'tag_count': np.zeros(len(products_df), dtype=np.int32),
+        'tier': products_df['Tier'].to_numpy(object),
+        'demand_index': products_df['demand_index'].to_numpy(np.float64),
+        'competitor_avg': products_df['competitor_avg'].to_numpy(np.float64),
+    }, index=products_df.index)
+
+@st.cache_data(show_spinner=False)
+def compute_recommendations(products_df, ml_weight=0.5):
+    """Score every product with the pricing engine; returns (rec_df, failed_count)"""
+    engine = get_engine(ml_weight)
+    
+    # Rows the engine can't price are found up front and get base-price defaults
+    valid = (
+        products_df['Base_Price'].gt(0)
+        & products_df['cost'].ge(0)
+        & products_df['competitor_avg'].notna()
+        & products_df['demand_index'].notna()
+        & products_df['Tier'].notna()
+        & products_df['Product_Lifecycle'].notna()
+    )
+    failed_count = int((~valid).sum())
+    
+    parts = []
+    if valid.any():
+        parts.append(engine.get_recommendations_batch(products_df[valid]))
+    if failed_count:
+        parts.append(default_recommendations(products_df[~valid]))
+    rec_df = pd.concat(parts).reindex(products_df.index) if parts else default_recommendations(products_df)
+    
+    rec_df['sku'] = products_df['SKU']
+    rec_df['base_price'] = products_df['Base_Price']
+    rec_df['category'] = products_df['Category'].astype('category')
+    rec_df['index'] = products_df.index  # Keep original index
+    
+    return rec_df, failed_count
+
+@st.cache_data(show_spinner=False)
+def category_revenue_stats(rec_df):
+    """Recommended revenue and average margin per category, largest first"""
+    category_revenue = rec_df.groupby('category', observed=True).agg({
+        'recommended_price': 'sum',
+        'margin_pct': 'mean'
+    }).reset_index()
+    category_revenue.columns = ['Category', 'Revenue', 'Avg Margin']
+    return category_revenue.sort_values('Revenue', ascending=False)
+
+@st.cache_data(show_spinner=False)
+def tier_performance_stats(rec_df):
+    """Average margin, average change and product count per tier"""
+    tier_stats = rec_df.groupby('tier').agg({
+        'margin_pct': 'mean',
+        'price_change_pct': 'mean',
+        'recommended_price': 'count'
+    }).reset_index()
+    tier_stats.columns = ['Tier', 'Avg Margin', 'Avg Change', 'Product Count']
+    return tier_stats
 
 def render():
     """Render the Insights tab with real data"""
@@ -21,7 +174,6 @@ def render():
     # Load real data
     try:
         products_df = get_product_data()
-        engine = get_pricing_engine(ml_weight=0.5)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return
@@ -45,6 +197,7 @@ def render():
     
     with col3:
         if st.button("Refresh", key="refresh_insights"):
+            compute_recommendations.clear()
             st.rerun()
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -55,70 +208,29 @@ def render():
     # Calculate key metrics FIRST - use actual product count
     total_products = len(products_df)  # This is the ACTUAL count from Excel
     
-    # Calculate pricing recommendations for all products
-    recommendations = []
-    failed_count = 0
-    for idx, row in products_df.iterrows():
-        try:
-            rec = engine.get_recommendation(
-                product_name=row['Product_Name'],
-                base_price=row['Base_Price'],
-                cost=row['cost'],
-                tier=row['Tier'],
-                category=row['Category'],
-                lifecycle=row['Product_Lifecycle'],
-                competitor_avg=row['competitor_avg'],
-                market_oos=row['market_out_of_stock'],
-                demand_index=row['demand_index']
-            )
-            rec['sku'] = row['SKU']
-            rec['base_price'] = row['Base_Price']
-            rec['category'] = row['Category']
-            rec['index'] = idx  # Keep original index
-            recommendations.append(rec)
-        except Exception as e:
-            # Track failures but don't stop
-            failed_count += 1
-            # Create default recommendation for failed products
-            recommendations.append({
-                'product_name': row['Product_Name'],
-                'recommended_price': row['Base_Price'],
-                'rules_price': row['Base_Price'],
-                'ml_price': row['Base_Price'],
-                'ml_adjustment_pct': 0.0,
-                'price_change_pct': 0.0,
-                'margin_pct': ((row['Base_Price'] - row['cost']) / row['Base_Price'] * 100) if row['Base_Price'] > 0 else 0,
-                'smart_tags': [],
-                'tier': row['Tier'],
-                'demand_index': row['demand_index'],
-                'competitor_avg': row['competitor_avg'],
-                'rule_adjustments': {},
-                'sku': row['SKU'],
-                'base_price': row['Base_Price'],
-                'category': row['Category'],
-                'index': idx
-            })
-            continue
-    
-    rec_df = pd.DataFrame(recommendations)
+    # Calculate pricing recommendations (cached until the product data changes)
+    rec_df, failed_count = compute_recommendations(products_df, ml_weight=0.5)
     
     # Debug info
     if failed_count > 0:
         st.sidebar.warning(f" {failed_count} products failed ML processing (using base prices)")
     
-    total_base_revenue = (products_df['Base_Price'] * products_df['demand_index']).sum()
+    # float32 is ample for cent-level prices and halves the bytes each pass moves
+    base_price = products_df['Base_Price'].to_numpy(np.float32)
+    demand_index = products_df['demand_index'].to_numpy(np.float32)
+    total_base_revenue = float(np.dot(base_price, demand_index))
     
     # Calculate optimized revenue - handle missing recommendations
     if len(rec_df) > 0:
         # Match recommendations back to products by index or SKU
-        products_with_rec = products_df.copy()
-        products_with_rec['optimized_price'] = products_with_rec['Base_Price']  # Default
-        
-        for _, rec in rec_df.iterrows():
-            if 'index' in rec:
-                products_with_rec.loc[rec['index'], 'optimized_price'] = rec['recommended_price']
+        optimized_price = (
+            rec_df.set_index('index')['recommended_price']
+            .reindex(products_df.index)
+            .fillna(products_df['Base_Price'])  # Default
+            .to_numpy(np.float32)
+        )
         
-        total_optimized_revenue = (products_with_rec['optimized_price'] * products_with_rec['demand_index']).sum()
+        total_optimized_revenue = float(np.dot(optimized_price, demand_index))
         avg_margin = rec_df['margin_pct'].mean()
     else:
         total_optimized_revenue = total_base_revenue
@@ -127,89 +239,25 @@ def render():
     revenue_uplift = ((total_optimized_revenue - total_base_revenue) / total_base_revenue * 100) if total_base_revenue > 0 else 0
     
     # Count products needing price adjustments (from successful recommendations only)
-    price_increases = len(rec_df[rec_df['price_change_pct'] > 0]) if len(rec_df) > 0 else 0
-    price_decreases = len(rec_df[rec_df['price_change_pct'] < 0]) if len(rec_df) > 0 else 0
-    products_with_tags = len(rec_df[rec_df['smart_tags'].apply(lambda x: len(x) > 0 if isinstance(x, list) else False)]) if len(rec_df) > 0 else 0
+    price_change = rec_df['price_change_pct'].to_numpy(np.float32)
+    price_increases = int((price_change > 0).sum())
+    price_decreases = int((price_change < 0).sum())
+    products_with_tags = int(rec_df['tag_count'].gt(0).sum())
     
     # Hero Metrics Row - 4 KPI Cards
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-icon green">
-                <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
-                    <line x1="12" y1="2" x2="12" y2="22"></line>
-                    <path d="M17 5H9.5a3.5 3.5 0 0 0 0 7h5a3.5 3.5 0 0 1 0 7H6"></path>
-                </svg>
-            </div>
-            <div class="metric-label">Potential Revenue</div>
-            <div class="metric-value">${total_optimized_revenue:,.0f}</div>
-            <div class="metric-change">
-                <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
-                    <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
-                    <polyline points="17 6 23 6 23 12"></polyline>
-                </svg>
-                +{revenue_uplift:.1f}% vs current pricing
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_REVENUE_CARD.substitute(revenue=f"{total_optimized_revenue:,.0f}", uplift=f"{revenue_uplift:.1f}"), unsafe_allow_html=True)
     
     with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-icon pink">
-                <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
-                    <polyline points="22 12 18 12 15 21 9 3 6 12 2 12"></polyline>
-                </svg>
-            </div>
-            <div class="metric-label">Avg Profit Margin</div>
-            <div class="metric-value">{avg_margin:.1f}%</div>
-            <div class="metric-change">
-                <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
-                    <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
-                    <polyline points="17 6 23 6 23 12"></polyline>
-                </svg>
-                AI-optimized margins
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_MARGIN_CARD.substitute(margin=f"{avg_margin:.1f}"), unsafe_allow_html=True)
     
     with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-icon magenta">
-                <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
-                    <path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path>
-                </svg>
-            </div>
-            <div class="metric-label">Active Products</div>
-            <div class="metric-value">{total_products}</div>
-            <div class="metric-change" style="color: #F48FB1;">
-                {products_with_tags} with smart tags
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PRODUCTS_CARD.substitute(products=total_products, tagged=products_with_tags), unsafe_allow_html=True)
     
     with col4:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-icon gold">
-                <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5">
-                    <polygon points="13 2 3 14 12 14 11 22 21 10 12 10 13 2"></polygon>
-                </svg>
-            </div>
-            <div class="metric-label">Price Adjustments</div>
-            <div class="metric-value">{price_increases + price_decreases}</div>
-            <div class="metric-change">
-                <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3">
-                    <polyline points="23 6 13.5 15.5 8.5 10.5 1 18"></polyline>
-                    <polyline points="17 6 23 6 23 12"></polyline>
-                </svg>
-                ↑{price_increases} ↓{price_decreases} recommended
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ADJUSTMENTS_CARD.substitute(adjustments=price_increases + price_decreases, increases=price_increases, decreases=price_decreases), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -229,8 +277,9 @@ def render():
     
     # Create monthly projection
     months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    current_monthly = [total_base_revenue * (1 + np.random.uniform(-0.05, 0.05)) for _ in months]
-    optimized_monthly = [total_optimized_revenue * (1 + np.random.uniform(-0.03, 0.07)) for _ in months]
+    # float32 NumPy arrays ship to plotly.js as binary typed arrays rather than JSON lists
+    current_monthly = (total_base_revenue * (1 + rng.uniform(-0.05, 0.05, size=len(months)))).astype(np.float32)
+    optimized_monthly = (total_optimized_revenue * (1 + rng.uniform(-0.03, 0.07, size=len(months)))).astype(np.float32)
     
     fig_forecast = go.Figure()
     
@@ -283,18 +332,13 @@ def render():
         st.markdown('<div class="chart-title"> Revenue by Category</div>', unsafe_allow_html=True)
         
         # Calculate category revenue
-        category_revenue = rec_df.groupby('category').agg({
-            'recommended_price': 'sum',
-            'margin_pct': 'mean'
-        }).reset_index()
-        category_revenue.columns = ['Category', 'Revenue', 'Avg Margin']
-        category_revenue = category_revenue.sort_values('Revenue', ascending=False)
+        category_revenue = category_revenue_stats(rec_df[['category', 'recommended_price', 'margin_pct']])
         
         fig_category = go.Figure()
         
         fig_category.add_trace(go.Bar(
             y=category_revenue['Category'],
-            x=category_revenue['Revenue'],
+            x=category_revenue['Revenue'].to_numpy(np.float32),
             orientation='h',
             marker=dict(
                 color=category_revenue['Avg Margin'],
@@ -327,13 +371,18 @@ def render():
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-title"> Price Change Distribution</div>', unsafe_allow_html=True)
         
+        # Bin server-side so only the 20 bar heights go to the browser
+        counts, edges = np.histogram(price_change, bins=20)
+        centers = ((edges[:-1] + edges[1:]) / 2).astype(np.float32)
+        
         fig_histogram = go.Figure()
         
-        fig_histogram.add_trace(go.Histogram(
-            x=rec_df['price_change_pct'],
-            nbinsx=20,
+        fig_histogram.add_trace(go.Bar(
+            x=centers,
+            y=counts,
+            width=np.diff(edges).astype(np.float32),
             marker=dict(
-                color=rec_df['price_change_pct'],
+                color=centers,
                 colorscale=[[0, '#EF5350'], [0.5, '#F48FB1'], [1, '#E57373']],
                 line=dict(color='#E57373', width=1)
             ),
@@ -365,12 +414,7 @@ def render():
         st.markdown('<div class="chart-title"> Performance by Tier</div>', unsafe_allow_html=True)
         
         # Calculate tier performance
-        tier_stats = rec_df.groupby('tier').agg({
-            'margin_pct': 'mean',
-            'price_change_pct': 'mean',
-            'recommended_price': 'count'
-        }).reset_index()
-        tier_stats.columns = ['Tier', 'Avg Margin', 'Avg Change', 'Product Count']
+        tier_stats = tier_performance_stats(rec_df[['tier', 'margin_pct', 'price_change_pct', 'recommended_price']])
         
         fig_tier = go.Figure()
         
@@ -426,20 +470,16 @@ def render():
         
         fig_elasticity_trend = go.Figure()
         
+        # Simulate every tier's monthly elasticity in one broadcast
+        month_idx = np.arange(months_slider)
+        seasonal = 0.1 * np.sin(2 * np.pi * month_idx / 12)  # Seasonal variation
+        trend = 0.02 * month_idx  # Becoming less elastic over time
+        noise = rng.normal(0, 0.05, size=(len(tier_elasticity), months_slider))
+        base_elasticities = np.fromiter(tier_elasticity.values(), dtype=np.float64)[:, None]
+        elasticity_matrix = (base_elasticities + seasonal + trend + noise).astype(np.float32)
+        
         # Create trend lines for each tier
-        for tier, base_elasticity in tier_elasticity.items():
-            elasticities = []
-            for i in range(months_slider):
-                # Add seasonal variation
-                seasonal = 0.1 * np.sin(2 * np.pi * i / 12)
-                # Add trend (becoming less elastic over time)
-                trend = 0.02 * i
-                # Add random noise
-                noise = np.random.normal(0, 0.05)
-                
-                monthly_elasticity = base_elasticity + seasonal + trend + noise
-                elasticities.append(monthly_elasticity)
-            
+        for tier, elasticities in zip(tier_elasticity, elasticity_matrix):
             # Colors by tier
             colors = {
                 'Low': '#EF5350',
@@ -520,11 +560,13 @@ def render():
     
     # Calculate average prices from competitor columns - ONLY 4 COMPETITORS
     if 'competitor1_price' in products_df.columns:
+        staples_col = 'Staples_price' if 'Staples_price' in products_df.columns else 'Base_Price'
+        comp_means = products_df[['competitor1_price', 'competitor2_price', 'competitor3_price', staples_col]].mean()
         competitors = [
-            {'name': 'Budget Janitorial', 'avg_price': products_df['competitor1_price'].mean(), 'market_share': 28},
-            {'name': 'All-Brite Sales', 'avg_price': products_df['competitor2_price'].mean(), 'market_share': 22},
-            {'name': 'CleanALL Supply', 'avg_price': products_df['competitor3_price'].mean(), 'market_share': 18},
-            {'name': 'Staples', 'avg_price': products_df.get('Staples_price', products_df['Base_Price']).mean() if 'Staples_price' in products_df.columns else products_df['Base_Price'].mean(), 'market_share': 15}
+            {'name': 'Budget Janitorial', 'avg_price': comp_means['competitor1_price'], 'market_share': 28},
+            {'name': 'All-Brite Sales', 'avg_price': comp_means['competitor2_price'], 'market_share': 22},
+            {'name': 'CleanALL Supply', 'avg_price': comp_means['competitor3_price'], 'market_share': 18},
+            {'name': 'Staples', 'avg_price': comp_means[staples_col], 'market_share': 15}
         ]
     else:
         # Fallback if no competitor columns - ONLY 4 COMPETITORS
@@ -5,7 +5,8 @@ extended panel length, larger input boxes, and centered text alignment.
 """
 import streamlit as st
 import hashlib
-import base64
+import hmac
+import os
 from pathlib import Path
 
 
@@ -18,69 +19,8 @@ DEMO_USERS = {
 }
 
 
-def hash_password(password: str) -> str:
-    """Simple password hashing for demo purposes."""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def check_credentials(username: str, password: str) -> dict:
-    """Verify login credentials."""
-    username = username.lower().strip()
-    if username in DEMO_USERS:
-        if DEMO_USERS[username]["password"] == password:
-            return {
-                "valid": True,
-                "name": DEMO_USERS[username]["name"],
-                "role": DEMO_USERS[username]["role"],
-                "username": username
-            }
-    return {"valid": False}
-
-
-def get_background_image():
-    """
-    Load and encode the background image.
-    Place your background image as 'background.png' in the same directory as this script.
-    """
-    # Try to load the background image
-    image_path = Path(__file__).parent / "background.png"
-    
-    if image_path.exists():
-        try:
-            with open(image_path, "rb") as f:
-                data = base64.b64encode(f.read()).decode()
-            return f"data:image/png;base64,{data}"
-        except:
-            return None
-    else:
-        # Fallback to gradient if image not found
-        return None
-
-
-def render_login_page():
-    """Render the login page with the two-column UI design, using red/maroon tones and background image."""
-    
-    # Get background image
-    bg_image = get_background_image()
-    
-    # Determine background style for left panel
-    if bg_image:
-        left_panel_bg = f"""
-            background-image: url('{bg_image}');
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-        """
-    else:
-        # Fallback gradient
-        left_panel_bg = """
-            background: linear-gradient(135deg, #E57373 0%, #EF5350 25%, #F48FB1 50%, #E57373 75%, #EF5350 100%);
-        """
-    
-    # -----------------------------------------------------------
-    # 1. Custom CSS for Global Styles and Background
-    # -----------------------------------------------------------
-    st.markdown(f"""
+# Login page stylesheet; the left panel background is the only substituted value
+_LOGIN_CSS = """
         <style>
         /* Import Google Font */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
@@ -250,19 +190,26 @@ def render_login_page():
         }}
         
         /* Sign Up Button (secondary) */
-        .signup-button .stButton > button {{
+        .st-key-signup_button button {{
             background: transparent !important;
             border: 2px solid rgba(229, 115, 115, 0.4) !important;
             color: #E57373 !important;
             box-shadow: none !important;
         }}
         
-        .signup-button .stButton > button:hover {{
+        .st-key-signup_button button:hover {{
             background: rgba(229, 115, 115, 0.08) !important;
             border-color: rgba(229, 115, 115, 0.6) !important;
             transform: translateY(-2px) !important;
         }}
         
+        /* Remember me / forgot password row */
+        .login-actions {{
+            display: flex;
+            justify-content: flex-end;
+            margin-top: -36px;
+        }}
+        
         /* Forgot password link */
         .forgot-link {{
             text-align: right;
@@ -339,7 +286,84 @@ def render_login_page():
             }}
         }}
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+def hash_password(password: str, salt: bytes) -> bytes:
+    """Salted scrypt hash; memory-hard, so each guess costs an attacker real work."""
+    return hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1)
+
+
+# Normalize usernames and replace plaintext demo passwords with salted hashes once at import
+DEMO_USERS = {name.casefold(): user for name, user in DEMO_USERS.items()}
+for _user in DEMO_USERS.values():
+    _user["salt"] = os.urandom(16)
+    _user["hash"] = hash_password(_user.pop("password"), _user["salt"])
+
+# Unknown usernames are checked against this so they take as long as known ones
+_DUMMY_SALT = os.urandom(16)
+_DUMMY_HASH = hash_password("", _DUMMY_SALT)
+
+
+def check_credentials(username: str, password: str) -> dict:
+    """Verify login credentials."""
+    username = username.strip().casefold()
+    record = DEMO_USERS.get(username)
+    salt, expected = (record["salt"], record["hash"]) if record else (_DUMMY_SALT, _DUMMY_HASH)
+    if hmac.compare_digest(hash_password(password, salt), expected) and record:
+        return {
+            "valid": True,
+            "name": record["name"],
+            "role": record["role"],
+            "username": username
+        }
+    return {"valid": False}
+
+
+# Served by Streamlit's static file server (server.enableStaticServing) so the
+# browser fetches and HTTP-caches it once instead of receiving base64 every rerun
+BACKGROUND_IMAGE_PATH = Path(__file__).parent.parent / "static" / "background.png"
+BACKGROUND_IMAGE_URL = "./app/static/background.png"
+
+
+def get_background_image():
+    """
+    Return the URL of the background image, or None to use the gradient.
+    Place your background image as 'background.png' in src/static/.
+    """
+    # The file probe runs once per session rather than on every keystroke rerun
+    if "bg_image_url" not in st.session_state:
+        if BACKGROUND_IMAGE_PATH.exists():
+            st.session_state.bg_image_url = BACKGROUND_IMAGE_URL
+        else:
+            # Fallback to gradient if image not found
+            st.session_state.bg_image_url = None
+    return st.session_state.bg_image_url
+
+
+# Both left-panel variants are formatted once at import; render only picks one
+_LOGIN_CSS_IMAGE = _LOGIN_CSS.format(left_panel_bg=f"""
+            background-image: url('{BACKGROUND_IMAGE_URL}');
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+        """)
+_LOGIN_CSS_GRADIENT = _LOGIN_CSS.format(left_panel_bg="""
+            background: linear-gradient(135deg, #E57373 0%, #EF5350 25%, #F48FB1 50%, #E57373 75%, #EF5350 100%);
+        """)
+
+# Forgot-password link sits on the checkbox row via .login-actions flex, not st.columns
+_LOGIN_ACTIONS_HTML = '<div class="login-actions"><div class="forgot-link">Forgot password?</div></div>'
+
+
+def render_login_page():
+    """Render the login page with the two-column UI design, using red/maroon tones and background image."""
+    
+    # -----------------------------------------------------------
+    # 1. Custom CSS for Global Styles and Background
+    # -----------------------------------------------------------
+    login_css = _LOGIN_CSS_IMAGE if get_background_image() else _LOGIN_CSS_GRADIENT
+    st.markdown(login_css, unsafe_allow_html=True)
     
     # Main container
     st.markdown('<div class="login-container">', unsafe_allow_html=True)
@@ -367,66 +391,66 @@ def render_login_page():
     with col_right:
         st.markdown('<div class="login-right-panel"><div class="form-container">', unsafe_allow_html=True)
         
-        # Login Form
-        with st.form("login_form"):
-            # Username Field
-            username = st.text_input(
-                "User Name", 
-                placeholder="User name",
-                key="login_username"
-            )
-            
-            # Password Field
-            password = st.text_input(
-                "Password",
-                type="password",
-                placeholder="••••••••••••",
-                key="login_password"
-            )
-            
-            # Checkbox and Forgot Password Link
-            col_check, col_forgot = st.columns([1.5, 1])
-            with col_check:
-                st.checkbox("Remember me", value=False)
-            with col_forgot:
-                st.markdown('<div class="forgot-link">Forgot password?</div>', unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Login Button
-            col_login, col_space = st.columns([1, 2])
-            with col_login:
-                submit = st.form_submit_button("Login", use_container_width=True)
-            
-            # Login Logic
-            if submit:
-                if username and password:
-                    result = check_credentials(username, password)
-                    if result["valid"]:
-                        st.session_state.logged_in = True
-                        st.session_state.user_name = result["name"]
-                        st.session_state.user_role = result["role"]
-                        st.session_state.username = result["username"]
-                        st.success(f"Welcome back, {result['name']}!")
-                        st.rerun()
-                    else:
-                        st.error("Invalid username or password")
-                else:
-                    st.warning("Please enter both username and password")
-
-        # Sign Up Button (outside form)
-        st.markdown('<div class="signup-button">', unsafe_allow_html=True)
-        col_space1, col_signup, col_space2 = st.columns([1.5, 1, 1])
-        with col_signup:
-            if st.button("Sign Up", use_container_width=True, key="signup_button"):
-                st.info("Sign up functionality coming soon!")
-        st.markdown('</div>', unsafe_allow_html=True)
-
+        render_login_form()
 
     # Close the container
     st.markdown('</div>', unsafe_allow_html=True)
 
 
+@st.fragment
+def render_login_form():
+    """Login form and sign-up button; their reruns leave the CSS and left panel untouched."""
+    # Login Form
+    with st.form("login_form"):
+        # Username Field
+        username = st.text_input(
+            "User Name", 
+            placeholder="User name",
+            key="login_username"
+        )
+        
+        # Password Field
+        password = st.text_input(
+            "Password",
+            type="password",
+            placeholder="••••••••••••",
+            key="login_password"
+        )
+        
+        # Checkbox and Forgot Password Link
+        st.checkbox("Remember me", value=False)
+        st.markdown(_LOGIN_ACTIONS_HTML, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Login Button
+        col_login, col_space = st.columns([1, 2])
+        with col_login:
+            submit = st.form_submit_button("Login", use_container_width=True)
+        
+        # Login Logic
+        if submit:
+            if username and password:
+                result = check_credentials(username, password)
+                if result["valid"]:
+                    st.session_state.logged_in = True
+                    st.session_state.user_name = result["name"]
+                    st.session_state.user_role = result["role"]
+                    st.session_state.username = result["username"]
+                    st.success(f"Welcome back, {result['name']}!")
+                    st.rerun()
+                else:
+                    st.error("Invalid username or password")
+            else:
+                st.warning("Please enter both username and password")
+
+    # Sign Up Button (outside form), styled via its st-key class
+    col_space1, col_signup, col_space2 = st.columns([1.5, 1, 1])
+    with col_signup:
+        if st.button("Sign Up", use_container_width=True, key="signup_button"):
+            st.info("Sign up functionality coming soon!")
+
+
 def is_logged_in() -> bool:
     """Check if user is logged in."""
     return st.session_state.get("logged_in", False)
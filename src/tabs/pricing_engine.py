@@ -3,9 +3,77 @@ Ultra-Fast Pricing Engine - Loads Instantly
 No heavy computation on initial load
 """
 
+import math
+import os
+import sys
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+from bisect import bisect_right
+
+# Already imported by the other tabs at startup, so checking here costs nothing extra
+try:
+    from ml_engine import PricingEngine
+    _HAS_ML_ENGINE = True
+except ImportError:
+    _HAS_ML_ENGINE = False
+
+
+# Built once at import; re-sent every run because Streamlit drops elements a rerun skips
+_SCROLLBAR_CSS = """
+<style>
+/* Make scrollbars visible */
+.stDataFrame [data-testid="stDataFrameResizable"] {
+    border: 2px solid #e0e0e0;
+    border-radius: 8px;
+    background-color: white;
+}
+
+/* Scrollbar styling for better visibility */
+.stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar {
+    width: 12px;
+    height: 12px;
+}
+
+.stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-track {
+    background: #f1f1f1;
+    border-radius: 10px;
+}
+
+.stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-thumb {
+    background: #888;
+    border-radius: 10px;
+    border: 2px solid #f1f1f1;
+}
+
+.stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-thumb:hover {
+    background: #555;
+}
+
+/* Firefox scrollbar */
+.stDataFrame div[data-testid="stDataFrameResizable"] {
+    scrollbar-width: auto;
+    scrollbar-color: #888 #f1f1f1;
+}
+</style>
+"""
+
+# Calculation Details body for the single-product tab
+_DETAILS_TEMPLATE = """
+**Base Calculation:**
+- Base Price: ${base_price:.2f}
+- Cost: ${cost:.2f}
+- ML Weight: {ml_weight:.0%}
+
+**Context:**
+- Season: {season}
+- Time: {time_of_day}
+- End of Month: {eom}
+
+**Final Price:** ${hybrid_price:.2f} ({hybrid_delta:+.1f}%)
+"""
 
 
 # ===================================================================
@@ -18,43 +86,7 @@ def render():
     """
     
     # Add custom CSS for visible scrollbars
-    st.markdown("""
-    <style>
-    /* Make scrollbars visible */
-    .stDataFrame [data-testid="stDataFrameResizable"] {
-        border: 2px solid #e0e0e0;
-        border-radius: 8px;
-        background-color: white;
-    }
-    
-    /* Scrollbar styling for better visibility */
-    .stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar {
-        width: 12px;
-        height: 12px;
-    }
-    
-    .stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-track {
-        background: #f1f1f1;
-        border-radius: 10px;
-    }
-    
-    .stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-thumb {
-        background: #888;
-        border-radius: 10px;
-        border: 2px solid #f1f1f1;
-    }
-    
-    .stDataFrame div[data-testid="stDataFrameResizable"] ::-webkit-scrollbar-thumb:hover {
-        background: #555;
-    }
-    
-    /* Firefox scrollbar */
-    .stDataFrame div[data-testid="stDataFrameResizable"] {
-        scrollbar-width: auto;
-        scrollbar-color: #888 #f1f1f1;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_SCROLLBAR_CSS, unsafe_allow_html=True)
     
     # Show immediately
     st.markdown("## Pricing Engine")
@@ -66,7 +98,9 @@ def render():
         st.session_state.products_df = None
         st.session_state.recommendations_cache = None
         st.session_state.last_ml_weight = None
-        st.session_state.base_calculations = None  # Store rules and ML prices
+        st.session_state.base_df = None  # Store rules and ML prices
+        st.session_state.blend_inputs = None  # base_df's BLEND_COLUMNS as a (4, N) array
+        st.session_state.num_arrays = None  # Numeric base/hybrid prices for the stats
 
     
     # Create tabs immediately (no waiting)
@@ -104,68 +138,54 @@ def show_all_products_tab():
     
     # Check if ML weight changed and we have existing data
     if (st.session_state.get('recommendations_cache') is not None and 
-        st.session_state.get('base_calculations') is not None and
+        st.session_state.get('base_df') is not None and
+        st.session_state.get('blend_inputs') is not None and
         st.session_state.get('last_ml_weight') != ml_weight):
         
-        # Recalculate hybrid prices with new ML weight
-        updated_recommendations = []
-        base_calcs = st.session_state.base_calculations
+        # Rules and ML adjustments don't depend on the weight, so only the blend is redone
+        base_df = st.session_state.base_df
         
         with st.spinner(f"Recalculating hybrid prices with {ml_weight:.0%} ML weight..."):
-            for base_calc in base_calcs:
-                # Extract stored values
-                base_price = base_calc['base_price']
-                rules_adjustment = base_calc['rules_adjustment']
-                ml_adjustment = base_calc['ml_adjustment']
-                cost = base_calc['cost']
-                
-                # Recalculate hybrid price with new ML weight
-                blended_adjustment = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
-                hybrid_price = base_price * (1 + blended_adjustment)
-                hybrid_delta = blended_adjustment * 100
-                margin_pct = ((hybrid_price - cost) / hybrid_price * 100) if hybrid_price > 0 else 0
-                
-                # Regenerate smart tags with new hybrid delta
-                smart_tags = generate_smart_tags(
-                    demand_index=base_calc['demand_index'],
-                    price_change_pct=hybrid_delta,
-                    margin_pct=margin_pct,
-                    lifecycle=base_calc['lifecycle'],
-                    market_out_of_stock=base_calc['market_oos'],
-                    tier=base_calc['tier'],
-                    base_price=base_price,
-                    cost=cost
-                )
-                
-                # Create updated recommendation
-                updated_recommendations.append({
-                    'SKU': base_calc['sku'],
-                    'Product': base_calc['product_name'],
-                    'Tier': base_calc['tier'].upper(),
-                    'Base Price': f"${base_price:.2f}",
-                    'Rules Price': f"${base_calc['rules_price']:.2f}",
-                    'ML Price': f"${base_calc['ml_price']:.2f}",
-                    'Hybrid Price': f"${hybrid_price:.2f}",
-                    'Season': base_calc['season'],
-                    'Time of Day': base_calc['time_of_day'],
-                    'End of Month': base_calc['end_of_month'],
-                    'Smart Tags': smart_tags[:50] + '...' if len(smart_tags) > 50 else smart_tags,
-                    'Demand': f"{base_calc['demand_index']:.2f}",
-                    'Lifecycle': base_calc['lifecycle']
-                })
+            base_price, cost, rules_adjustment, ml_adjustment = st.session_state.blend_inputs
+            hybrid_price, hybrid_delta, margin_pct = blend_prices(
+                base_price, cost, rules_adjustment, ml_adjustment, ml_weight
+            )
+            
+            # Regenerate smart tags only where the new delta or margin lands in a different band
+            changed = np.flatnonzero(
+                smart_tag_bands(hybrid_delta, margin_pct)
+                != smart_tag_bands(base_df['hybrid_delta'].to_numpy(), base_df['margin_pct'].to_numpy())
+            )
+            # Everything else keeps its previous tags by position
+            smart_tags = base_df['smart_tags'].to_numpy(copy=True)
+            smart_tags[changed] = generate_smart_tags_batch(
+                base_df['demand_index'].to_numpy()[changed],
+                hybrid_delta[changed],
+                margin_pct[changed],
+                base_df['lifecycle'].to_numpy()[changed],
+                base_df['market_oos'].to_numpy()[changed],
+                base_df['tier'].to_numpy()[changed],
+                base_price[changed],
+                cost[changed]
+            )
+            
+            base_df['hybrid_price'] = hybrid_price
+            base_df['hybrid_delta'] = hybrid_delta
+            base_df['margin_pct'] = margin_pct
+            base_df['smart_tags'] = smart_tags
+            updated_recommendations = base_df
         
         # Update cache
         st.session_state.recommendations_cache = updated_recommendations
+        num_arrays = st.session_state.num_arrays
+        num_arrays['hybrid'] = np.round(hybrid_price, 2).astype(np.float32)
+        num_arrays['has_tags'] = smart_tags != _NO_TAGS
         st.session_state.last_ml_weight = ml_weight
         
         st.success(f"✅ Updated {len(updated_recommendations)} products with new ML weight: {ml_weight:.0%}")
         
         # Show updated results
-        st.dataframe(
-            pd.DataFrame(updated_recommendations),
-            use_container_width=True,
-            height=600
-        )
+        show_recommendations_table(updated_recommendations)
         
         # Show summary stats
         st.markdown("---")
@@ -176,20 +196,22 @@ def show_all_products_tab():
         with col1:
             st.metric("Total Products", len(updated_recommendations))
         
+        base_px, hybrid_px = num_arrays['base'], num_arrays['hybrid']
+        
         with col2:
-            increases = sum(1 for r in updated_recommendations if float(r['Hybrid Price'].replace('$', '')) > float(r['Base Price'].replace('$', '')))
+            increases = int(np.count_nonzero(hybrid_px > base_px))
             st.metric("Price Increases", increases)
         
         with col3:
-            decreases = sum(1 for r in updated_recommendations if float(r['Hybrid Price'].replace('$', '')) < float(r['Base Price'].replace('$', '')))
+            decreases = int(np.count_nonzero(hybrid_px < base_px))
             st.metric("Price Decreases", decreases)
         
         with col4:
-            avg_change = sum((float(r['Hybrid Price'].replace('$', '')) - float(r['Base Price'].replace('$', ''))) / float(r['Base Price'].replace('$', '')) * 100 for r in updated_recommendations) / len(updated_recommendations)
+            avg_change = float(np.mean((hybrid_px - base_px) / base_px * 100))
             st.metric("Avg Change", f"{avg_change:+.1f}%")
         
         with col5:
-            with_tags = sum(1 for r in updated_recommendations if r['Smart Tags'] != 'No tags')
+            with_tags = int(np.count_nonzero(num_arrays['has_tags']))
             st.metric("Products w/ Tags", with_tags)
         
         st.info(f"💡 ML Weight: {ml_weight:.0%} (Rules: {(1-ml_weight):.0%}, ML: {ml_weight:.0%})")
@@ -242,164 +264,45 @@ def show_all_products_tab():
             status_text.text(f"Generating recommendations for all {total_products} products...")
             progress_bar.progress(70)
             
-            recommendations = []
-            
-            # Reset base calculations for fresh load
-            st.session_state.base_calculations = []
-            
-            # Process all products
-            subset = products_df
-            
             # Get ML weight from slider (if exists, otherwise use default)
             ml_weight = st.session_state.get('ml_weight_slider', 0.5)
             
-            for idx, (_, row) in enumerate(subset.iterrows()):
-                
-                # Update progress
-                if idx % 10 == 0:  # Update every 10 products
-                    progress = 70 + (idx / len(subset) * 25)
-                    progress_bar.progress(int(progress))
-                    status_text.text(f"Processing product {idx+1}/{len(subset)}...")
-                
-                try:
-                    sku = str(row.get('SKU', ''))
-                    product_name = str(row.get('Product_Name', 'Unknown'))[:30]
-                    base_price = float(row.get('Base_Price', 0))
-                    cost = float(row.get('cost', base_price * 0.70))
-                    tier = str(row.get('Tier', 'Mid'))
-                    category = str(row.get('Category', 'Other'))
-                    lifecycle = str(row.get('Product_Lifecycle', 'Maturity'))
-                    demand_index = float(row.get('demand_index', 1.0))
-                    
-                    # Get competitor data
-                    competitor_avg = base_price
-                    market_oos = False
-                    if 'market_out_of_stock' in row.index:
-                        market_oos = bool(row['market_out_of_stock'])
-                    
-                    # Get Rules price (ML weight = 0)
-                    engine_rules, _ = get_ml_engine(0.0)
-                    rec_rules = engine_rules.get_recommendation(
-                        product_name=product_name,
-                        base_price=base_price,
-                        cost=cost,
-                        tier=tier,
-                        category=category,
-                        lifecycle=lifecycle,
-                        competitor_avg=competitor_avg,
-                        market_oos=market_oos,
-                        demand_index=demand_index
-                    )
-                    rules_price = rec_rules.get('recommended_price', base_price)
-                    rules_adjustment = (rules_price - base_price) / base_price if base_price > 0 else 0
-                    
-                    # Get ML price (ML weight = 1)
-                    engine_ml, _ = get_ml_engine(1.0)
-                    rec_ml = engine_ml.get_recommendation(
-                        product_name=product_name,
-                        base_price=base_price,
-                        cost=cost,
-                        tier=tier,
-                        category=category,
-                        lifecycle=lifecycle,
-                        competitor_avg=competitor_avg,
-                        market_oos=market_oos,
-                        demand_index=demand_index
-                    )
-                    ml_price = rec_ml.get('recommended_price', base_price)
-                    ml_adjustment = (ml_price - base_price) / base_price if base_price > 0 else 0
-                    
-                    # Calculate Hybrid price using blending formula (matches app.py logic)
-                    # Hybrid = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
-                    blended_adjustment = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
-                    hybrid_price = base_price * (1 + blended_adjustment)
-                    
-                    # Calculate margin based on hybrid price
-                    margin_pct = ((hybrid_price - cost) / hybrid_price * 100) if hybrid_price > 0 else 0
-                    
-                    # Calculate deltas
-                    hybrid_delta = ((hybrid_price - base_price) / base_price * 100) if base_price > 0 else 0
-                    
-                    # Generate smart tags
-                    smart_tags = generate_smart_tags(
-                        demand_index=demand_index,
-                        price_change_pct=hybrid_delta,
-                        margin_pct=margin_pct,
-                        lifecycle=lifecycle,
-                        market_out_of_stock=market_oos,
-                        tier=tier,
-                        base_price=base_price,
-                        cost=cost
-                    )
-                    
-                    # Default context values (can be customized)
-                    season = "Normal"
-                    time_of_day = "Peak"
-                    end_of_month = "No"
-                    
-                    # Store base calculation for efficient recalculation
-                    st.session_state.base_calculations.append({
-                        'sku': sku,
-                        'product_name': product_name,
-                        'tier': tier,
-                        'base_price': base_price,
-                        'cost': cost,
-                        'rules_price': rules_price,
-                        'rules_adjustment': rules_adjustment,
-                        'ml_price': ml_price,
-                        'ml_adjustment': ml_adjustment,
-                        'demand_index': demand_index,
-                        'lifecycle': lifecycle,
-                        'market_oos': market_oos,
-                        'season': season,
-                        'time_of_day': time_of_day,
-                        'end_of_month': end_of_month
-                    })
-                    
-                    recommendations.append({
-                        'SKU': sku,
-                        'Product': product_name,
-                        'Tier': tier.upper(),
-                        'Base Price': f"${base_price:.2f}",
-                        'Rules Price': f"${rules_price:.2f}",
-                        'ML Price': f"${ml_price:.2f}",
-                        'Hybrid Price': f"${hybrid_price:.2f}",
-                        'Season': season,
-                        'Time of Day': time_of_day,
-                        'End of Month': end_of_month,
-                        'Smart Tags': smart_tags[:50] + '...' if len(smart_tags) > 50 else smart_tags,
-                        'Demand': f"{demand_index:.2f}",
-                        'Lifecycle': lifecycle
-                    })
-                    
-                except Exception as e:
-                    continue
+            # Rules and ML prices for every product in one batched engine call
+            calc_df = price_all_products(products_df, ml_weight)
+            progress_bar.progress(90)
+            
+            # Store base calculations for efficient recalculation; the table is formatted from them
+            st.session_state.base_df = calc_df
+            # Blend inputs as one contiguous (4, N) block, one row per field
+            st.session_state.blend_inputs = np.ascontiguousarray(calc_df[BLEND_COLUMNS].to_numpy().T)
+            recommendations = calc_df
             
             progress_bar.progress(95)
             status_text.text("Finalizing...")
             
-            if recommendations:
+            if not recommendations.empty:
                 progress_bar.progress(100)
                 status_text.text(" Complete!")
                 
-                # Store initial data in session state
-                if 'all_products_df' not in st.session_state:
-                    st.session_state.all_products_df = products_df
-                    st.session_state.recommendations_cache = recommendations
-                    st.session_state.current_batch = 1  # Already loaded first batch
-                    st.session_state.last_ml_weight = ml_weight  # Store initial ML weight
+                # Store fresh data in session state; a reload replaces the previous results
+                st.session_state.all_products_df = products_df
+                st.session_state.recommendations_cache = recommendations
+                # Numeric twins of the table columns for the summary stats; cent-rounded
+                # prices are still distinct in float32, so the counts don't change
+                st.session_state.num_arrays = {
+                    'base': calc_df['base_price'].to_numpy(np.float32),
+                    'hybrid': calc_df['hybrid_price'].round(2).to_numpy(np.float32),
+                    'has_tags': (calc_df['smart_tags'] != _NO_TAGS).to_numpy(),
+                }
+                st.session_state.current_batch = 1  # Already loaded first batch
+                st.session_state.last_ml_weight = ml_weight  # Store initial ML weight
                 
-                # Get all accumulated recommendations
-                all_recs = st.session_state.get('recommendations_cache', recommendations)
+                all_recs = recommendations
                 
                 st.success(f" Generated {len(all_recs)} recommendations")
                 
                 # Show results
-                st.dataframe(
-                    pd.DataFrame(all_recs),
-                    use_container_width=True,
-                    height=600
-                )
+                show_recommendations_table(all_recs)
                 
                 # Enhanced Stats
                 st.markdown("---")
@@ -410,24 +313,27 @@ def show_all_products_tab():
                 with col1:
                     st.metric("Total Products", len(all_recs))
                 
+                num_arrays = st.session_state.num_arrays
+                base_px, hybrid_px = num_arrays['base'], num_arrays['hybrid']
+                
                 with col2:
                     # Count products with price increases
-                    increases = sum(1 for r in all_recs if float(r['Hybrid Price'].replace('$', '')) > float(r['Base Price'].replace('$', '')))
+                    increases = int(np.count_nonzero(hybrid_px > base_px))
                     st.metric("Price Increases", increases)
                 
                 with col3:
                     # Count products with price decreases
-                    decreases = sum(1 for r in all_recs if float(r['Hybrid Price'].replace('$', '')) < float(r['Base Price'].replace('$', '')))
+                    decreases = int(np.count_nonzero(hybrid_px < base_px))
                     st.metric("Price Decreases", decreases)
                 
                 with col4:
                     # Average price change
-                    avg_change = sum((float(r['Hybrid Price'].replace('$', '')) - float(r['Base Price'].replace('$', ''))) / float(r['Base Price'].replace('$', '')) * 100 for r in all_recs) / len(all_recs)
+                    avg_change = float(np.mean((hybrid_px - base_px) / base_px * 100))
                     st.metric("Avg Change", f"{avg_change:+.1f}%")
                 
                 with col5:
                     # Count products with tags
-                    with_tags = sum(1 for r in all_recs if r['Smart Tags'] != 'No tags')
+                    with_tags = int(np.count_nonzero(num_arrays['has_tags']))
                     st.metric("Products w/ Tags", with_tags)
                 
                 # Show completion message
@@ -447,6 +353,33 @@ def show_all_products_tab():
         st.info(" Click 'Load Product Data' to see pricing recommendations for all products")
         
 
+@st.fragment
+def show_recommendations_table(recommendations, preview_rows=200):
+    """Format and send only the first rows unless the user asks for all.
+    Widgets here rerun just this fragment, so the rest of the tab stays put."""
+    shown = recommendations
+    if len(recommendations) > preview_rows:
+        show_all = st.toggle(f"Show all {len(recommendations)} rows", value=False, key="show_all_rows")
+        if not show_all:
+            shown = recommendations.head(preview_rows)
+    
+    st.dataframe(
+        format_recommendations(shown),
+        use_container_width=True,
+        height=600
+    )
+    
+    # The full CSV is only serialized once asked for, not on every rerun; the
+    # download click only reruns this fragment
+    if st.button("Prepare CSV Export", key="prepare_pricing_csv"):
+        st.download_button(
+            label="Download full CSV",
+            data=recommendations.to_csv(index=False).encode(),
+            file_name=f"pricing_recommendations_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv"
+        )
+
+
 def load_next_batch(ml_weight, engine):
     """Load next 30 products incrementally"""
     
@@ -471,34 +404,44 @@ def load_next_batch(ml_weight, engine):
         status_text.text(f"Loading products {start_idx + 1} to {end_idx}...")
         progress_bar.progress(20)
         
-        new_recommendations = []
+        # Typed column buffers filled row by row, formatted in one pass after the loop
+        batch = {col: np.empty(len(subset), dtype=object)
+                 for col in ['sku', 'product_name', 'tier', 'lifecycle', 'smart_tags']}
+        batch.update({col: np.empty(len(subset))
+                      for col in ['base_price', 'rules_price', 'ml_price', 'hybrid_price', 'demand_index']})
+        # Tag inputs that are not cache columns; the whole batch is tagged in one call after the loop
+        tag_inputs = {col: np.empty(len(subset)) for col in ['hybrid_delta', 'margin_pct', 'cost']}
+        tag_inputs['market_oos'] = np.empty(len(subset), dtype=bool)
+        filled = 0
         
-        for idx, (_, row) in enumerate(subset.iterrows()):
+        # Rules (ML weight 0) and ML (ML weight 1) engines, fetched once per batch
+        engine_rules, _ = get_ml_engine(0.0)
+        engine_ml, _ = get_ml_engine(1.0)
+        
+        # Plain tuples instead of a boxed Series per row; defaults are already filled in
+        rows = build_pricing_inputs(subset)[[
+            'SKU', 'Product_Name', 'Base_Price', 'cost', 'Tier', 'Category',
+            'Product_Lifecycle', 'demand_index', 'market_out_of_stock'
+        ]].itertuples(index=False, name=None)
+        
+        # At most ~20 progress updates however big the batch, each one is a browser round-trip
+        update_every = max(5, len(subset) // 20)
+        
+        for idx, row in enumerate(rows):
             
             # Update progress
-            if idx % 5 == 0:
+            if idx % update_every == 0:
                 progress = 20 + (idx / len(subset) * 70)
                 progress_bar.progress(int(progress))
                 status_text.text(f"Processing product {start_idx + idx + 1}/{len(products_df)}...")
             
             try:
-                sku = str(row.get('SKU', ''))
-                product_name = str(row.get('Product_Name', 'Unknown'))[:30]
-                base_price = float(row.get('Base_Price', 0))
-                cost = float(row.get('cost', base_price * 0.70))
-                tier = str(row.get('Tier', 'Mid'))
-                category = str(row.get('Category', 'Other'))
-                lifecycle = str(row.get('Product_Lifecycle', 'Maturity'))
-                demand_index = float(row.get('demand_index', 1.0))
+                sku, product_name, base_price, cost, tier, category, lifecycle, demand_index, market_oos = row
                 
                 # Get competitor data
                 competitor_avg = base_price
-                market_oos = False
-                if 'market_out_of_stock' in row.index:
-                    market_oos = bool(row['market_out_of_stock'])
                 
                 # Get Rules price (ML weight = 0)
-                engine_rules, _ = get_ml_engine(0.0)
                 rec_rules = engine_rules.get_recommendation(
                     product_name=product_name,
                     base_price=base_price,
@@ -513,7 +456,6 @@ def load_next_batch(ml_weight, engine):
                 rules_price = rec_rules.get('recommended_price', base_price)
                 
                 # Get ML price (ML weight = 1)
-                engine_ml, _ = get_ml_engine(1.0)
                 rec_ml = engine_ml.get_recommendation(
                     product_name=product_name,
                     base_price=base_price,
@@ -527,56 +469,28 @@ def load_next_batch(ml_weight, engine):
                 )
                 ml_price = rec_ml.get('recommended_price', base_price)
                 
-                # Get Hybrid price (current ML weight)
-                rec_hybrid = engine.get_recommendation(
-                    product_name=product_name,
-                    base_price=base_price,
-                    cost=cost,
-                    tier=tier,
-                    category=category,
-                    lifecycle=lifecycle,
-                    competitor_avg=competitor_avg,
-                    market_oos=market_oos,
-                    demand_index=demand_index
-                )
-                hybrid_price = rec_hybrid.get('recommended_price', base_price)
-                margin_pct = rec_hybrid.get('margin_pct', 0)
-                
-                # Calculate deltas
-                hybrid_delta = ((hybrid_price - base_price) / base_price * 100) if base_price > 0 else 0
-                
-                # Generate smart tags
-                smart_tags = generate_smart_tags(
-                    demand_index=demand_index,
-                    price_change_pct=hybrid_delta,
-                    margin_pct=margin_pct,
-                    lifecycle=lifecycle,
-                    market_out_of_stock=market_oos,
-                    tier=tier,
-                    base_price=base_price,
-                    cost=cost
-                )
-                
-                # Default context values
-                season = "Normal"
-                time_of_day = "Peak"
-                end_of_month = "No"
+                # Hybrid price from the same blend as the slider recalculation
+                rules_adjustment = (rules_price - base_price) / base_price
+                ml_adjustment = (ml_price - base_price) / base_price
+                blended_adjustment = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
+                hybrid_price = base_price * (1 + blended_adjustment)
+                margin_pct = ((hybrid_price - cost) / hybrid_price * 100) if hybrid_price > 0 else 0
+                hybrid_delta = blended_adjustment * 100
                 
-                new_recommendations.append({
-                    'SKU': sku,
-                    'Product': product_name,
-                    'Tier': tier.upper(),
-                    'Base Price': f"${base_price:.2f}",
-                    'Rules Price': f"${rules_price:.2f}",
-                    'ML Price': f"${ml_price:.2f}",
-                    'Hybrid Price': f"${hybrid_price:.2f}",
-                    'Season': season,
-                    'Time of Day': time_of_day,
-                    'End of Month': end_of_month,
-                    'Smart Tags': smart_tags[:50] + '...' if len(smart_tags) > 50 else smart_tags,
-                    'Demand': f"{demand_index:.2f}",
-                    'Lifecycle': lifecycle
-                })
+                batch['sku'][filled] = sku
+                batch['product_name'][filled] = product_name
+                batch['tier'][filled] = tier
+                batch['lifecycle'][filled] = lifecycle
+                batch['base_price'][filled] = base_price
+                batch['rules_price'][filled] = rules_price
+                batch['ml_price'][filled] = ml_price
+                batch['hybrid_price'][filled] = hybrid_price
+                batch['demand_index'][filled] = demand_index
+                tag_inputs['hybrid_delta'][filled] = hybrid_delta
+                tag_inputs['margin_pct'][filled] = margin_pct
+                tag_inputs['cost'][filled] = cost
+                tag_inputs['market_oos'][filled] = market_oos
+                filled += 1
                 
             except Exception as e:
                 print(f"Error processing product: {e}")
@@ -585,9 +499,31 @@ def load_next_batch(ml_weight, engine):
         progress_bar.progress(95)
         status_text.text("Finalizing...")
         
-        if new_recommendations:
+        # Generate smart tags straight from the column buffers
+        batch['smart_tags'][:filled] = generate_smart_tags_batch(
+            demand_index=batch['demand_index'][:filled],
+            price_change_pct=tag_inputs['hybrid_delta'][:filled],
+            margin_pct=tag_inputs['margin_pct'][:filled],
+            lifecycle=batch['lifecycle'][:filled],
+            market_out_of_stock=tag_inputs['market_oos'][:filled],
+            tier=batch['tier'][:filled],
+            base_price=batch['base_price'][:filled],
+            cost=tag_inputs['cost'][:filled]
+        )
+        
+        batch_df = pd.DataFrame({col: values[:filled] for col, values in batch.items()})
+        # Default context values
+        batch_df['season'] = "Normal"
+        batch_df['time_of_day'] = "Peak"
+        batch_df['end_of_month'] = "No"
+        new_recommendations = batch_df
+        
+        if filled:
             # Add to cache
-            st.session_state.recommendations_cache.extend(new_recommendations)
+            st.session_state.recommendations_cache = pd.concat(
+                [st.session_state.recommendations_cache, new_recommendations],
+                ignore_index=True
+            )
             st.session_state.current_batch += 1
             
             progress_bar.progress(100)
@@ -620,11 +556,14 @@ def show_single_product_tab():
             return
         
         # Product selection
-        sku_options = ["Select a product..."]
-        for _, row in products_df.head(50).iterrows():  # Limit to 50 for dropdown speed
-            sku = str(row['SKU'])
-            name = str(row.get('Product_Name', 'Unknown'))[:40]
-            sku_options.append(f"{sku} – {name}")
+        dropdown_df = products_df.head(50)  # Limit to 50 for dropdown speed
+        names = (
+            dropdown_df['Product_Name'] if 'Product_Name' in dropdown_df.columns
+            else pd.Series('Unknown', index=dropdown_df.index)
+        )
+        sku_options = ["Select a product..."] + (
+            dropdown_df['SKU'].astype(str) + " – " + names.astype(str).str.slice(0, 40)
+        ).tolist()
         
         selected = st.selectbox("Select Product", sku_options)
         
@@ -634,14 +573,8 @@ def show_single_product_tab():
         
         selected_sku = selected.split(" – ")[0]
         
-        # Get product
-        product_row = products_df[products_df['SKU'].astype(str) == selected_sku]
-        
-        if product_row.empty:
-            st.error(f"Product {selected_sku} not found")
-            return
-        
-        product_row = product_row.iloc[0]
+        # Options line up with dropdown_df rows, so the position finds the product directly
+        product_row = dropdown_df.iloc[sku_options.index(selected) - 1]
         
         # Show product info
         col1, col2 = st.columns(2)
@@ -737,31 +670,23 @@ def show_single_product_tab():
                     st.markdown("---")
                     st.markdown("###  Pricing Results")
                     
-                    # Price comparison
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric(
-                            "Base Price",
-                            f"${base_price:.2f}",
-                            help="Current price"
-                        )
-                    
-                    with col2:
-                        st.metric(
-                            "Recommended Price",
-                            f"${hybrid_price:.2f}",
-                            f"{hybrid_delta:+.1f}%",
-                            delta_color="normal"
-                        )
-                    
-                    with col3:
-                        margin = ((hybrid_price - cost) / hybrid_price * 100) if hybrid_price > 0 else 0
-                        st.metric(
-                            "Margin",
-                            f"{margin:.1f}%",
-                            help=f"Cost: ${cost:.2f}"
-                        )
+                    # Price comparison - the three cards are emitted as one block
+                    margin = ((hybrid_price - cost) / hybrid_price * 100) if hybrid_price > 0 else 0
+                    metric_specs = [
+                        ("Base Price", f"${base_price:.2f}", "Current price"),
+                        ("Recommended Price", f"${hybrid_price:.2f}", f"{'↗' if hybrid_delta >= 0 else '↘'} {hybrid_delta:+.1f}%"),
+                        ("Margin", f"{margin:.1f}%", f"Cost: ${cost:.2f}"),
+                    ]
+                    metric_cards = "".join(
+                        f"""
+                        <div class="metric-card" style="flex: 1;">
+                            <div class="metric-label">{label}</div>
+                            <div class="metric-value">{value}</div>
+                            <div class="metric-change">{change}</div>
+                        </div>"""
+                        for label, value, change in metric_specs
+                    )
+                    st.markdown(f'<div style="display: flex; gap: 16px;">{metric_cards}</div>', unsafe_allow_html=True)
                     
                     # Adjustments applied
                     if adjustments:
@@ -771,19 +696,16 @@ def show_single_product_tab():
                     
                     # Context summary
                     with st.expander("Calculation Details"):
-                        st.markdown(f"""
-**Base Calculation:**
-- Base Price: ${base_price:.2f}
-- Cost: ${cost:.2f}
-- ML Weight: {ml_weight:.0%}
-
-**Context:**
-- Season: {season}
-- Time: {time_of_day}
-- End of Month: {'Yes' if end_of_month else 'No'}
-
-**Final Price:** ${hybrid_price:.2f} ({hybrid_delta:+.1f}%)
-                        """)
+                        st.markdown(_DETAILS_TEMPLATE.format(
+                            base_price=base_price,
+                            cost=cost,
+                            ml_weight=ml_weight,
+                            season=season,
+                            time_of_day=time_of_day,
+                            eom='Yes' if end_of_month else 'No',
+                            hybrid_price=hybrid_price,
+                            hybrid_delta=hybrid_delta
+                        ))
                     
                     st.success("Price calculated successfully!")
                     
@@ -802,6 +724,199 @@ def show_single_product_tab():
 # HELPER FUNCTIONS (Optimized for Speed)
 # ===================================================================
 
+# Per-product defaults used when a column is missing from the product data
+PRICING_DEFAULTS = {
+    'Product_Name': 'Unknown',
+    'Tier': 'Mid',
+    'Category': 'Other',
+    'Product_Lifecycle': 'Maturity',
+    'demand_index': 1.0,
+    'market_out_of_stock': False,
+}
+
+
+def build_pricing_inputs(products_df):
+    """Engine-ready copy of products_df with the per-product defaults applied column-wise"""
+    inputs = products_df.reindex(columns=['SKU', 'Base_Price', 'cost', *PRICING_DEFAULTS])
+    for col, default in PRICING_DEFAULTS.items():
+        if col not in products_df.columns:
+            inputs[col] = default
+    
+    for col in ['SKU', 'Product_Name', 'Tier', 'Category', 'Product_Lifecycle']:
+        inputs[col] = inputs[col].astype(str)
+    inputs['Product_Name'] = inputs['Product_Name'].str.slice(0, 30)
+    inputs['Base_Price'] = inputs['Base_Price'].astype(float)
+    if 'cost' not in products_df.columns:
+        inputs['cost'] = inputs['Base_Price'] * 0.70
+    inputs['cost'] = inputs['cost'].astype(float)
+    inputs['demand_index'] = inputs['demand_index'].astype(float)
+    inputs['market_out_of_stock'] = inputs['market_out_of_stock'].astype(bool)
+    inputs['competitor_avg'] = inputs['Base_Price']
+    
+    # The engine divides by base price, so unpriced products are skipped
+    return inputs[inputs['Base_Price'] > 0]
+
+
+@st.cache_data(show_spinner=False)
+def price_all_products(products_df, ml_weight):
+    """
+    Rules (ML weight 0), ML (ML weight 1) and hybrid prices for every product.
+    Returns one row per priceable product with the base calculation fields.
+    Cached on the data and weight, so repeat loads of unchanged data are instant.
+    """
+    inputs = build_pricing_inputs(products_df)
+    engine, _ = get_ml_engine()
+    
+    base_price = inputs['Base_Price'].to_numpy()
+    cost = inputs['cost'].to_numpy()
+    # Rules price = recommendation at ML weight 0, ML price = at ML weight 1
+    rules_price, ml_price = engine.get_recommended_prices_batch(inputs, (0.0, 1.0))
+    rules_adjustment = (rules_price - base_price) / base_price
+    ml_adjustment = (ml_price - base_price) / base_price
+    
+    hybrid_price, hybrid_delta, margin_pct = blend_prices(
+        base_price, cost, rules_adjustment, ml_adjustment, ml_weight
+    )
+    
+    calc_df = pd.DataFrame({
+        'sku': inputs['SKU'].to_numpy(),
+        'product_name': inputs['Product_Name'].to_numpy(),
+        'tier': inputs['Tier'].to_numpy(),
+        'base_price': base_price,
+        'cost': cost,
+        'rules_price': rules_price,
+        'rules_adjustment': rules_adjustment,
+        'ml_price': ml_price,
+        'ml_adjustment': ml_adjustment,
+        'demand_index': inputs['demand_index'].to_numpy(),
+        'lifecycle': inputs['Product_Lifecycle'].to_numpy(),
+        'market_oos': inputs['market_out_of_stock'].to_numpy(),
+        # Default context values (can be customized)
+        'season': pd.Categorical(["Normal"] * len(inputs)),
+        'time_of_day': pd.Categorical(["Peak"] * len(inputs)),
+        'end_of_month': pd.Categorical(["No"] * len(inputs)),
+        'hybrid_price': hybrid_price,
+        'hybrid_delta': hybrid_delta,
+        'margin_pct': margin_pct,
+    })
+    calc_df['tier'] = calc_df['tier'].astype('category')
+    calc_df['lifecycle'] = calc_df['lifecycle'].astype('category')
+    calc_df['smart_tags'] = generate_smart_tags_batch(
+        calc_df['demand_index'].to_numpy(), hybrid_delta, margin_pct,
+        calc_df['lifecycle'].to_numpy(), calc_df['market_oos'].to_numpy(),
+        calc_df['tier'].to_numpy(), base_price, cost
+    )
+    return calc_df
+
+
+# Weight-independent base_df columns the slider recalculation reads
+BLEND_COLUMNS = ['base_price', 'cost', 'rules_adjustment', 'ml_adjustment']
+
+
+def blend_prices(base_price, cost, rules_adjustment, ml_adjustment, ml_weight):
+    """
+    Hybrid price, price change % and margin % for one ML weight.
+    Works in place on three output arrays instead of a temporary per operation.
+    """
+    # Hybrid = (1 - ml_weight) * rules_adjustment + ml_weight * ml_adjustment
+    hybrid_delta = np.multiply(rules_adjustment, 1 - ml_weight)
+    hybrid_price = np.multiply(ml_adjustment, ml_weight)
+    hybrid_delta += hybrid_price
+    
+    np.add(hybrid_delta, 1, out=hybrid_price)
+    hybrid_price *= base_price
+    hybrid_delta *= 100
+    
+    margin_pct = np.subtract(hybrid_price, cost)
+    priced = hybrid_price > 0
+    np.divide(margin_pct, hybrid_price, out=margin_pct, where=priced)
+    margin_pct[~priced] = 0
+    margin_pct *= 100
+    return hybrid_price, hybrid_delta, margin_pct
+
+
+def smart_tag_bands(price_change_pct, margin_pct):
+    """
+    Which price-change and margin thresholds of generate_smart_tags each row falls in.
+    Rows whose bands don't move keep the same tags.
+    """
+    price_band = np.select(
+        [price_change_pct >= 10, price_change_pct >= 3, price_change_pct <= -10, price_change_pct <= -3],
+        [1, 2, 3, 4], 0
+    )
+    margin_band = np.select(
+        [margin_pct >= 35, margin_pct >= 28, margin_pct >= 18, margin_pct <= 10],
+        [1, 2, 3, 4], 0
+    )
+    return price_band * 5 + margin_band
+
+
+def format_recommendations(calc_df):
+    """Display table for priced products, formatted column-wise"""
+    tags = calc_df['smart_tags']
+    return pd.DataFrame({
+        'SKU': calc_df['sku'],
+        'Product': calc_df['product_name'],
+        'Tier': calc_df['tier'].str.upper(),
+        'Base Price': calc_df['base_price'].map("${:.2f}".format),
+        'Rules Price': calc_df['rules_price'].map("${:.2f}".format),
+        'ML Price': calc_df['ml_price'].map("${:.2f}".format),
+        'Hybrid Price': calc_df['hybrid_price'].map("${:.2f}".format),
+        'Season': calc_df['season'],
+        'Time of Day': calc_df['time_of_day'],
+        'End of Month': calc_df['end_of_month'],
+        'Smart Tags': tags.str.slice(0, 50) + np.where(tags.str.len() > 50, '...', ''),
+        'Demand': calc_df['demand_index'].map("{:.2f}".format),
+        'Lifecycle': calc_df['lifecycle'],
+    })
+
+# Label lookups for generate_smart_tags, keyed by the lowercased value
+_LIFECYCLE_TAG = {
+    'introduction': "New arrival",
+    'launch': "New arrival",
+    'new': "New arrival",
+    'growth': "Growing",
+    'decline': "End-of-life",
+}
+_TIER_TAG = {'premium': "Premium Tier"}
+_TIER_MIN_MARGIN = {'low': 0.10, 'mid': 0.15, 'high': 0.20, 'premium': 0.25}
+
+# Sorted band edges for bisect_right: labels[i] applies once i edges are <= the value.
+# The low bands are "<= edge", so their edge is nudged to the next float up.
+_DEMAND_THRESH = (math.nextafter(0.75, math.inf), 1.15, 1.3)
+_DEMAND_LABELS = ("Low Demand", None, "High Demand", "Very High Demand")
+_PRICE_CHANGE_THRESH = (math.nextafter(-10, math.inf), math.nextafter(-3, math.inf), 3, 10)
+_PRICE_CHANGE_LABELS = ("↘ Large Discount", "↘ Price Decrease", None, "↗ Price Increase", "↗ Large Increase")
+_MARGIN_THRESH = (math.nextafter(10, math.inf), 18, 28, 35)
+_MARGIN_LABELS = ("Low Margin", None, "Healthy Margin", "Premium Margin", "Exceptional Margin")
+
+# Every tag in output order (at most one fires per group), and its bit in a tag mask
+_TAG_NAMES = (
+    "New arrival", "Growing", "End-of-life",
+    "Low Demand", "High Demand", "Very High Demand",
+    "↗ Large Increase", "↗ Price Increase", "↘ Large Discount", "↘ Price Decrease",
+    "Low Margin", "Healthy Margin", "Premium Margin", "Exceptional Margin",
+    " Competitor Out-of-Stock",
+    "Premium Tier",
+    " Margin Watch",
+)
+_TAG_BIT = {name: 1 << i for i, name in enumerate(_TAG_NAMES)}
+# Returned for every untagged row; a single tag comes back as its _TAG_NAMES entry itself
+_NO_TAGS = sys.intern("No tags")
+
+
+def _tag_bits(*names):
+    """_TAG_BIT values for names as uint32 scalars, so np.select/np.where build uint32 directly."""
+    return [np.uint32(_TAG_BIT[name]) for name in names]
+
+
+def _band_label(value, thresholds, labels):
+    """Label of the band value falls in; None (or NaN, which compares False) gets none."""
+    if value is None or value != value:
+        return None
+    return labels[bisect_right(thresholds, value)]
+
+
 def generate_smart_tags(
     demand_index,
     price_change_pct,
@@ -813,100 +928,179 @@ def generate_smart_tags(
     cost=None
 ):
     """Generate smart tags with relaxed thresholds."""
-    tags = []
+    # Nothing to tag on (margin watch also needs a tier): skip normalizing and the cache
+    if (demand_index is None and price_change_pct is None and margin_pct is None
+            and not lifecycle and not market_out_of_stock and not tier):
+        return _NO_TAGS
+    
+    # Labels are normalized before the cache lookup so 'Growth' and 'growth ' share an entry.
+    # Numbers go in exactly: rounding them could move a value across a tag threshold.
+    return _generate_smart_tags_impl(
+        demand_index,
+        price_change_pct,
+        margin_pct,
+        str(lifecycle).lower().strip(),
+        bool(market_out_of_stock),
+        str(tier).lower().strip() if tier else None,
+        base_price,
+        cost
+    )
+
+
+@lru_cache(maxsize=8192)
+def _generate_smart_tags_impl(demand_index, price_change_pct, margin_pct, lifecycle_lower,
+                              market_out_of_stock, tier_lower, base_price, cost):
+    """generate_smart_tags() body; lifecycle and tier arrive lowercased and stripped (tier None if not given)."""
+    # List-price margin as a fraction (None without a positive price and a cost);
+    # margin_pct is the caller's recommended-price margin, so it is not reused here
+    current_margin = (base_price - cost) / base_price if base_price and cost and base_price > 0 else None
+    bits = 0
     
     # Lifecycle (priority)
-    lifecycle_lower = str(lifecycle).lower().strip()
-    if lifecycle_lower in ['introduction', 'launch', 'new']:
-        tags.append("New arrival")
-    elif lifecycle_lower == 'growth':
-        tags.append("Growing")
-    elif lifecycle_lower == 'decline':
-        tags.append("End-of-life")
+    lifecycle_tag = _LIFECYCLE_TAG.get(lifecycle_lower)
+    if lifecycle_tag:
+        bits |= _TAG_BIT[lifecycle_tag]
     
     # Demand
-    if demand_index is not None:
-        if demand_index >= 1.3:
-            tags.append("Very High Demand")
-        elif demand_index >= 1.15:
-            tags.append("High Demand")
-        elif demand_index <= 0.75:
-            tags.append("Low Demand")
-    
-    # Price changes (≥2% threshold)
-    if price_change_pct is not None and abs(price_change_pct) >= 2:
-        if price_change_pct >= 10:
-            tags.append("↗ Large Increase")
-        elif price_change_pct >= 3:
-            tags.append("↗ Price Increase")
-        elif price_change_pct <= -10:
-            tags.append("↘ Large Discount")
-        elif price_change_pct <= -3:
-            tags.append("↘ Price Decrease")
+    demand_tag = _band_label(demand_index, _DEMAND_THRESH, _DEMAND_LABELS)
+    if demand_tag:
+        bits |= _TAG_BIT[demand_tag]
+    
+    # Price changes (|change| < 3 never tags, which also covers the 2% dead zone)
+    price_tag = _band_label(price_change_pct, _PRICE_CHANGE_THRESH, _PRICE_CHANGE_LABELS)
+    if price_tag:
+        bits |= _TAG_BIT[price_tag]
     
     # Margin
-    if margin_pct is not None:
-        if margin_pct >= 35:
-            tags.append("Exceptional Margin")
-        elif margin_pct >= 28:
-            tags.append("Premium Margin")
-        elif margin_pct >= 18:
-            tags.append("Healthy Margin")
-        elif margin_pct <= 10:
-            tags.append("Low Margin")
+    margin_tag = _band_label(margin_pct, _MARGIN_THRESH, _MARGIN_LABELS)
+    if margin_tag:
+        bits |= _TAG_BIT[margin_tag]
     
     # Competitive
     if market_out_of_stock:
-        tags.append(" Competitor Out-of-Stock")
+        bits |= _TAG_BIT[" Competitor Out-of-Stock"]
     
     # Tier
-    if tier:
-        tier_lower = str(tier).lower().strip()
-        if tier_lower == 'premium':
-            tags.append("Premium Tier")
+    tier_tag = _TIER_TAG.get(tier_lower)
+    if tier_tag:
+        bits |= _TAG_BIT[tier_tag]
     
     # Margin watch
-    if base_price and cost and tier:
-        tier_configs = {'low': 0.10, 'mid': 0.15, 'high': 0.20, 'premium': 0.25}
-        tier_lower = str(tier).lower().strip()
-        min_margin = tier_configs.get(tier_lower, 0.15)
-        current_margin = (base_price - cost) / base_price if base_price > 0 else 0
+    if current_margin is not None and tier_lower is not None:
+        min_margin = _TIER_MIN_MARGIN.get(tier_lower, 0.15)
         margin_buffer = current_margin - min_margin
         
         if 0 <= margin_buffer <= 0.02:
-            tags.append(" Margin Watch")
+            bits |= _TAG_BIT[" Margin Watch"]
+    
+    return _join_tags(bits)
+
+
+@lru_cache(maxsize=None)
+def _join_tags(bits):
+    """Tag string for a set of _TAG_NAMES bits; each distinct combination is joined once."""
+    return ", ".join(name for i, name in enumerate(_TAG_NAMES) if bits >> i & 1) or _NO_TAGS
+
+
+def generate_smart_tags_batch(demand_index, price_change_pct, margin_pct, lifecycle,
+                              market_out_of_stock, tier, base_price, cost):
+    """
+    generate_smart_tags() over parallel arrays (lifecycle and tier as strings).
+    Every rule ORs its bit into one uint32 mask per row; strings are built per distinct mask.
+    """
+    lifecycle_lower = pd.Series(lifecycle, dtype=object).astype(str).str.lower().str.strip()
+    tier_raw = pd.Series(tier, dtype=object).astype(str)
+    tier_lower = tier_raw.str.lower().str.strip()
+    
+    bits = lifecycle_lower.map(_LIFECYCLE_TAG).map(_TAG_BIT).fillna(0).to_numpy(dtype=np.uint32)
+    bits |= np.select(
+        [demand_index >= 1.3, demand_index >= 1.15, demand_index <= 0.75],
+        _tag_bits("Very High Demand", "High Demand", "Low Demand"), np.uint32(0)
+    )
+    # |change| < 3 never tags, so the 2% dead zone needs no separate mask
+    bits |= np.select(
+        [price_change_pct >= 10, price_change_pct >= 3, price_change_pct <= -10, price_change_pct <= -3],
+        _tag_bits("↗ Large Increase", "↗ Price Increase", "↘ Large Discount", "↘ Price Decrease"), np.uint32(0)
+    )
+    bits |= np.select(
+        [margin_pct >= 35, margin_pct >= 28, margin_pct >= 18, margin_pct <= 10],
+        _tag_bits("Exceptional Margin", "Premium Margin", "Healthy Margin", "Low Margin"), np.uint32(0)
+    )
+    bits |= np.where(market_out_of_stock, *_tag_bits(" Competitor Out-of-Stock"), np.uint32(0))
+    bits |= tier_lower.map(_TIER_TAG).map(_TAG_BIT).fillna(0).to_numpy(dtype=np.uint32)
     
-    return ", ".join(tags) if tags else "No tags"
+    # Margin watch: list price within 2 points above the tier's minimum margin
+    min_margin = tier_lower.map(_TIER_MIN_MARGIN).fillna(0.15).to_numpy()
+    current_margin = np.divide(
+        base_price - cost, base_price,
+        out=np.zeros(len(base_price)), where=base_price > 0
+    )
+    margin_buffer = current_margin - min_margin
+    margin_watch = (
+        (base_price != 0) & (cost != 0) & (tier_raw.str.len() > 0).to_numpy()
+        & (margin_buffer >= 0) & (margin_buffer <= 0.02)
+    )
+    bits |= np.where(margin_watch, *_tag_bits(" Margin Watch"), np.uint32(0))
+    
+    # Few distinct masks occur, so render each once and scatter back
+    masks, inverse = np.unique(bits, return_inverse=True)
+    labels = np.array([_join_tags(int(mask)) for mask in masks], dtype=object)
+    return labels[inverse.reshape(-1)]
+
+
+def product_data_version():
+    """Modification times of the product spreadsheets, used to key the data cache"""
+    try:
+        from data_loader import PRODUCTS_PATH, COMPETITOR_PATH, ORDERS_PATH
+        paths = [PRODUCTS_PATH, COMPETITOR_PATH, ORDERS_PATH]
+    except ImportError:
+        paths = ["ProductLibrary.xlsx"]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_product_data():
-    """Load product data with caching"""
+def load_product_data(mutable=False):
+    """
+    Load product data, re-reading the spreadsheets only after they change.
+    The frame is shared across reruns and sessions: pass mutable=True to get a copy to edit.
+    """
+    df = _load_product_data(product_data_version())
+    return df.copy() if mutable else df
+
+
+@st.cache_resource(ttl=3600, max_entries=1)  # Cache for 1 hour, latest file version only
+def _load_product_data(data_version):
+    """Load product data with caching; data_version only keys the cache"""
     
     try:
-        # Try data_loader first
+        # Try data_loader first; its own in-process copy would outlive a file change
         from data_loader import get_product_data
-        return get_product_data()
-    except:
-        pass
+        return get_product_data(force_reload=True)
+    except (ImportError, FileNotFoundError):
+        pass  # Anything else is a real data error and should surface
     
     try:
         # Try direct Excel load
         df = pd.read_excel("ProductLibrary.xlsx", engine='openpyxl')
         return df
-    except:
+    except (ImportError, FileNotFoundError):
         return pd.DataFrame()
 
 
-@st.cache_resource  # Cache engine instance
 def get_ml_engine(ml_weight=0.5):
     """Get ML engine with caching"""
+    # Snap to 0.05 steps so slider float noise (0.15000000000000002) reuses an engine
+    return _get_ml_engine_cached(round(ml_weight * 20) / 20)
+
+
+@st.cache_resource  # Cache engine instance, one per ml_weight bucket
+def _get_ml_engine_cached(ml_weight):
+    if not _HAS_ML_ENGINE:
+        return None, False
     
     try:
-        from ml_engine import PricingEngine
         engine = PricingEngine(ml_weight=ml_weight)
         return engine, True
-    except:
+    except Exception:
         return None, False
 
 